@@ -0,0 +1,300 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import zlib
+from datetime import datetime, timezone
+
+# --- CONFIGURATION ---
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(REPO_DIR, "bench_results")
+DEFAULT_SIZES = (100, 1000, 10000)
+
+# Material for synthetic songs: common characters so pypinyin has real work to do
+HANZI = ("的一是不了人我在有他这中大来上国个到说们为子和你地出道也时年得就那要下以生会自着去之过家学对可她里后小么心多天而能好都然没日于起还发成事只作当想看文无开手十用主行方又如前所本见经头面公同三已老从动两长知民样现分将外但身些与高意进把法此实回二理美点月明其种声全工己话儿者向情部正名定女问力机给等几很业最间新什打便位因重被走电四第门相次东政海口使教西再平真听世气信北少关并内加化由却代军产入先山五太水万市眼体别处总才场师书比住员九笑性通目华报立马命张活难神数件安表原车白应路期叫死常提感金何更反合放做系计或司利受光王果亲界及今京务制解各任至清物台象记边共风战干接它许八特觉望直服毛林题建南度统色字请交爱让认算论百吃义科怎元社术结六功指思非流每青管夫连远资队跟带花快条院变联言权往展该领传近留红治决周保达办运武半候七必城父强步完革深区即求品士转量空甚众技轻程告江语英基派满式李息写呢识极令黄德收脸钱党倒未持取设始版双历越史商千片容研像找友孩站广改议形委早房音火际则首单据导影失拿网香似斯专石若兵弟谁校读志飞观争究包组造落视济喜离虽坏兴")
+GENRES = ("Mandopop", "Classic Mandopop", "Blues Rock", "Chinese R&B", "Folk Rock",
+          "Hip Hop", "Ballad", "Cantopop", "Indie", "Electronic")
+ARTISTS = ("Wu Bai", "Lo Ta-yu", "Jacky Cheung", "Faye Wong", "Jay Chou", "Eason Chan",
+           "Teresa Teng", "G.E.M.", "Mayday", "Sodagreen", "Tanya Chua", "JJ Lin")
+# Stand-in pinyin: each character always gets the same syllable, so the pages
+# look like real ones (and pass validate.py) without needing pypinyin
+SYLLABLES = ("de", "yī", "shì", "bù", "le", "rén", "wǒ", "zài", "yǒu", "tā", "zhè", "zhōng",
+             "dà", "lái", "shàng", "guó", "gè", "dào", "shuō", "men", "wèi", "zǐ", "hé", "nǐ")
+WORDS = ("love", "heart", "forest", "rain", "night", "dream", "road", "moon", "river",
+         "memory", "light", "time", "home", "wind", "goodbye", "forever")
+
+# Roughly the size of the inline <style> block every real song page carries
+PAGE_STYLE = "\n".join(
+    f"      .rule-{i} {{ color: var(--text-sub); margin: {i % 7}px; padding: {i % 5}px; }}"
+    for i in range(120))
+
+# --- SYNTHETIC CATALOGUE ---
+
+def hanzi_line(rng, lo=4, hi=12):
+    return "".join(rng.choice(HANZI) for _ in range(rng.randint(lo, hi)))
+
+def pinyin_line(hanzi):
+    return " ".join(SYLLABLES[HANZI.find(ch) % len(SYLLABLES)] for ch in hanzi)
+
+def english_line(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))).capitalize()
+
+def synthetic_song(rng, num):
+    """One song's data in the song_data/ format; choruses repeat like real lyrics."""
+    title = hanzi_line(rng, 2, 6)
+    verse = [(hanzi_line(rng), english_line(rng)) for _ in range(rng.randint(12, 20))]
+    chorus = [(hanzi_line(rng), english_line(rng)) for _ in range(4)]
+    lyrics = verse[:len(verse) // 2] + chorus + verse[len(verse) // 2:] + chorus + chorus
+    vocab = []
+    for _ in range(rng.randint(3, 6)):
+        word = hanzi_line(rng, 2, 2)
+        vocab.append({"word": word, "pinyin": pinyin_line(word), "meaning": rng.choice(WORDS).title(),
+                      "sent_cn": hanzi_line(rng) + word + "。", "sent_en": english_line(rng)})
+    return {
+        "filename": f"{num}.{title} (Song {num}).html",
+        "title_cn": title,
+        "title_en": f"Song {num}",
+        "artist": rng.choice(ARTISTS),
+        "genre": rng.choice(GENRES),
+        "vocab": vocab,
+        "lyrics_raw": [list(line) for line in lyrics],
+    }
+
+def song_page(song, num):
+    """A songs/ page with the same .hero-text / .vocab-card / .lyric-row structure as the real ones."""
+    vocab = "".join(f"""
+          <div class="vocab-card">
+            <div class="vocab-header">
+              <span class="target-word">{v['word']}</span>
+              <span class="target-pinyin">{v['pinyin']}</span>
+              <span class="target-meaning">{v['meaning']}</span>
+            </div>
+            <div class="sentence-box">
+              <span class="cn-sent">{v['sent_cn']}</span>
+              <span class="en-sent">{v['sent_en']}</span>
+            </div>
+          </div>""" for v in song["vocab"])
+    lyrics = "".join(f"""
+          <div class="lyric-row">
+            <div class="hanzi-line">{cn}</div>
+            <div class="pinyin-line">{pinyin_line(cn)}</div>
+            <div class="eng-line">{en}</div>
+          </div>""" for cn, en in song["lyrics_raw"])
+    return f"""<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="UTF-8" />
+    <title>{song['title_en']} - Lyrics Study</title>
+    <style>
+{PAGE_STYLE}
+    </style>
+  </head>
+  <body>
+    <header class="hero">
+      <div class="album-art-placeholder">
+        <img src="../assets/images/{num}.cover.png" alt="Album Art" />
+      </div>
+      <div class="hero-text">
+        <span class="tag-pill">{song['genre']}</span>
+        <h1>{song['title_cn']}</h1>
+        <p>{song['title_en']} — {song['artist']}</p>
+      </div>
+    </header>
+    <div class="main-container">
+      <section>
+        <h2 class="section-title">Deep Dive Vocabulary</h2>
+        <div class="vocab-list">{vocab}
+        </div>
+      </section>
+      <section>
+        <h2 class="section-title">Lyrics</h2>
+        <div class="lyrics-container">{lyrics}
+        </div>
+      </section>
+    </div>
+  </body>
+</html>
+"""
+
+def cover_png(rng, size=64):
+    """A small solid-colour PNG written by hand, so Pillow is not needed."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    pixel = bytes(rng.randrange(256) for _ in range(3))
+    raw = b"".join(b"\x00" + pixel * size for _ in range(size))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw))
+            + chunk(b"IEND", b""))
+
+def make_catalogue(root, size, seed=0):
+    """Fill root with songs/, assets/images/ and song_data/ for `size` songs."""
+    rng = random.Random(seed)
+    for sub in ("songs", os.path.join("assets", "images"), "song_data"):
+        os.makedirs(os.path.join(root, sub), exist_ok=True)
+
+    for num in range(1, size + 1):
+        song = synthetic_song(rng, num)
+        with open(os.path.join(root, "songs", song["filename"]), "w", encoding="utf-8") as f:
+            f.write(song_page(song, num))
+        with open(os.path.join(root, "assets", "images", f"{num}.cover.png"), "wb") as f:
+            f.write(cover_png(rng))
+        with open(os.path.join(root, "song_data", f"{num}.json"), "w", encoding="utf-8") as f:
+            json.dump(song, f, ensure_ascii=False)
+
+# --- MEASUREMENT ---
+
+# Runs a build script as __main__ and reports wall time and peak RSS (incl. worker processes)
+RUNNER = """
+import json, os, runpy, sys, time
+out_path, script = sys.argv[1], sys.argv[2]
+sys.argv = [script] + sys.argv[3:]
+sys.path.insert(0, os.path.dirname(script))
+start = time.perf_counter()
+runpy.run_path(script, run_name="__main__")
+wall = time.perf_counter() - start
+peak = None
+try:
+    import resource
+    scale = 1 if sys.platform == "darwin" else 1024   # ru_maxrss is KB on Linux, bytes on macOS
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) * scale
+except ImportError:
+    pass
+with open(out_path, "w") as f:
+    json.dump({"wall": wall, "peak_mb": peak and round(peak / 2**20, 1)}, f)
+"""
+
+def run_python(code, cwd, *args):
+    """Run a snippet in a fresh interpreter inside cwd and return the JSON it writes."""
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as out:
+        out_path = out.name
+    try:
+        subprocess.run([sys.executable, "-c", code, out_path, *args],
+                       cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+        with open(out_path) as f:
+            return json.load(f)
+    finally:
+        os.remove(out_path)
+
+def run_script(script, cwd, *script_args):
+    return run_python(RUNNER, cwd, os.path.join(REPO_DIR, script), *script_args)
+
+def run_reported(script, cwd, *script_args):
+    """run_script() plus the per-stage timings from the script's own --report."""
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as report:
+        report_path = report.name
+    try:
+        result = run_script(script, cwd, *script_args, "--report", report_path)
+        with open(report_path) as f:
+            return result, json.load(f)["stages"]
+    finally:
+        os.remove(report_path)
+
+def clear_outputs(root):
+    for name in (".build_cache", "search", "vocab", "browse", os.path.join("assets", "build")):
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    for name in ("index.html", "catalogue.json"):
+        for suffix in ("", ".gz", ".br"):
+            if os.path.exists(os.path.join(root, name + suffix)):
+                os.remove(os.path.join(root, name + suffix))
+
+def bench_size(root, size, jobs):
+    print(f"🏗️  Generating {size} synthetic songs...")
+    make_catalogue(root, size)
+    result = {}
+
+    clear_outputs(root)
+    result["index_cold"], result["index_stages"] = run_reported("build_index.py", root, "--jobs", str(jobs))
+    # warm: every page served from the cache but all outputs rebuilt; noop: nothing changed
+    result["index_warm"] = run_script("build_index.py", root, "--jobs", str(jobs), "--force")
+    result["index_noop"] = run_script("build_index.py", root, "--jobs", str(jobs))
+
+    # build_pages.py writes its pages into the working directory
+    pages_dir = os.path.join(root, "pages_out")
+    os.makedirs(pages_dir, exist_ok=True)
+    result["pages"], result["pages_stages"] = run_reported(
+        "build_pages.py", pages_dir, "--source", os.path.join(root, "song_data"))
+    shutil.rmtree(pages_dir, ignore_errors=True)
+    return result
+
+# --- REPORTING ---
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def latest_result():
+    if not os.path.isdir(RESULTS_DIR):
+        return None
+    names = sorted(n for n in os.listdir(RESULTS_DIR) if n.endswith(".json"))
+    if not names:
+        return None
+    with open(os.path.join(RESULTS_DIR, names[-1]), encoding="utf-8") as f:
+        return json.load(f)
+
+def delta(now, before):
+    if not before:
+        return ""
+    return f" ({(now - before) / before * 100:+.0f}%)"
+
+def print_report(report, previous):
+    prev_sizes = (previous or {}).get("sizes", {})
+    if previous:
+        print(f"\n📊 Compared with {previous['commit']} ({previous['date']})")
+    for size, result in report["sizes"].items():
+        before = prev_sizes.get(size, {})
+        print(f"\n— {size} songs —")
+        for run in ("index_cold", "index_warm", "index_noop", "pages"):
+            if run not in result:
+                continue
+            r, b = result[run], before.get(run, {})
+            peak = f", peak {r['peak_mb']} MB" if r["peak_mb"] else ""
+            print(f"  {run:<12} {r['wall']:8.3f}s{delta(r['wall'], b.get('wall'))}{peak}")
+        for run in ("index_stages", "pages_stages"):
+            b = before.get(run, {})
+            stages = ", ".join(f"{name} {t:.3f}s{delta(t, b.get(name))}"
+                               for name, t in result[run].items())
+            print(f"  {run:<12} {stages}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark build_index.py and build_pages.py on synthetic catalogues.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="catalogue sizes to generate (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="passed to build_index.py --jobs")
+    parser.add_argument("--no-save", action="store_true", help="do not write results to bench_results/")
+    args = parser.parse_args()
+    if args.jobs < 0:
+        parser.error("-j/--jobs must be 0 or more")
+
+    previous = latest_result()
+    report = {
+        "commit": git_commit(),
+        "date": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": sys.version.split()[0],
+        "jobs": args.jobs,
+        "sizes": {},
+    }
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory(prefix=f"songs-bench-{size}-") as root:
+            report["sizes"][str(size)] = bench_size(root, size, args.jobs)
+
+    print_report(report, previous)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        name = f"{report['date'].replace(':', '')}-{report['commit']}.json"
+        with open(os.path.join(RESULTS_DIR, name), "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+        print(f"\n💾 Saved results to bench_results/{name}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+from file_writer import write_if_changed
+try:
+    from PIL import Image, features
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+# --- CONFIGURATION ---
+ROOT_DIR = os.getcwd()
+IMAGES_DIR = os.path.join(ROOT_DIR, "assets", "images")
+VARIANTS_DIR = os.path.join(IMAGES_DIR, "variants")
+MANIFEST_FILE = os.path.join(VARIANTS_DIR, "manifest.json")
+
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+# Cards are ~200px wide, so this covers 1x, 2x and 4x screens.
+# Covers smaller than a width get one variant at their own size instead.
+VARIANT_WIDTHS = (200, 400, 800)
+
+# Output formats, best compression first: (extension, Pillow format, save options)
+OUTPUT_FORMATS = [
+    ("avif", "AVIF", {"quality": 50}),
+    ("webp", "WEBP", {"quality": 75, "method": 6}),
+    ("jpg", "JPEG", {"quality": 80, "optimize": True, "progressive": True}),
+]
+
+# Transparent covers are flattened onto the card placeholder colour for JPEG
+JPEG_BACKGROUND = (51, 51, 51)
+
+def available_formats():
+    """OUTPUT_FORMATS minus anything this Pillow build cannot encode (JPEG always works)."""
+    return [fmt for fmt in OUTPUT_FORMATS
+            if fmt[0] == "jpg" or features.check(fmt[0])]
+
+def source_digest(filepath):
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+    return h.hexdigest()[:12]
+
+def load_manifest():
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest):
+    text = json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True)
+    write_if_changed(MANIFEST_FILE, text.encode("utf-8"))
+
+def is_up_to_date(entry, digest, formats):
+    """True if entry was encoded from this exact source and all its files still exist."""
+    if not entry or entry["hash"] != digest:
+        return False
+    if set(entry["variants"]) != {ext for ext, _, _ in formats}:
+        return False
+    return all(os.path.exists(os.path.join(VARIANTS_DIR, name))
+               for variants in entry["variants"].values()
+               for name, _, _ in variants)
+
+def encode_variants(src_path, name, digest, formats):
+    """Resize one cover to every width/format and return its manifest entry.
+
+    Output files are named "<stem>.<hash>.<width>w.<ext>", so a changed cover
+    gets new URLs and the old ones can be cached forever.
+    """
+    stem = os.path.splitext(name)[0]
+    with Image.open(src_path) as img:
+        img.load()
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        img = img.convert("RGBA" if has_alpha else "RGB")
+
+    src_w, src_h = img.size
+    entry = {"hash": digest, "width": src_w, "height": src_h, "variants": {}}
+
+    for width in sorted({min(w, src_w) for w in VARIANT_WIDTHS}):
+        height = round(src_h * width / src_w)
+        resized = img if width == src_w else img.resize((width, height), Image.LANCZOS)
+
+        for ext, pil_format, options in formats:
+            frame = resized
+            if pil_format == "JPEG" and has_alpha:
+                frame = Image.new("RGB", resized.size, JPEG_BACKGROUND)
+                frame.paste(resized, mask=resized.getchannel("A"))
+
+            out_name = f"{stem}.{digest}.{width}w.{ext}"
+            frame.save(os.path.join(VARIANTS_DIR, out_name), pil_format, **options)
+            entry["variants"].setdefault(ext, []).append([out_name, width, height])
+
+    return entry
+
+def build_variants():
+    if not HAS_PIL:
+        print("⚠️ 'Pillow' not found. Cards will use the original cover images.")
+        return
+    if not os.path.exists(IMAGES_DIR):
+        print(f"❌ Error: The folder '{IMAGES_DIR}' does not exist.")
+        return
+
+    os.makedirs(VARIANTS_DIR, exist_ok=True)
+    formats = available_formats()
+    manifest = load_manifest()
+    new_manifest = {}
+    encoded = 0
+
+    print(f"🖼️  Checking covers in '{IMAGES_DIR}' ({', '.join(ext for ext, _, _ in formats)})...")
+
+    for name in sorted(os.listdir(IMAGES_DIR)):
+        src_path = os.path.join(IMAGES_DIR, name)
+        if not name.lower().endswith(SOURCE_EXTENSIONS) or not os.path.isfile(src_path):
+            continue
+
+        digest = source_digest(src_path)
+        entry = manifest.get(name)
+        if is_up_to_date(entry, digest, formats):
+            new_manifest[name] = entry
+            continue
+
+        try:
+            new_manifest[name] = encode_variants(src_path, name, digest, formats)
+            encoded += 1
+            print(f"🔨 Encoded: {name}")
+        except OSError as e:
+            print(f"⚠️ Error encoding {name}: {e}")
+
+    # Remove variants of covers that were changed or deleted
+    keep = {MANIFEST_FILE}
+    for entry in new_manifest.values():
+        for variants in entry["variants"].values():
+            keep.update(os.path.join(VARIANTS_DIR, v[0]) for v in variants)
+    for name in os.listdir(VARIANTS_DIR):
+        path = os.path.join(VARIANTS_DIR, name)
+        if path not in keep:
+            os.remove(path)
+
+    save_manifest(new_manifest)
+    print(f"✅ Cover variants ready: {encoded} encoded, {len(new_manifest) - encoded} unchanged.")
+
+if __name__ == "__main__":
+    build_variants()
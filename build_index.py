@@ -1,8 +1,30 @@
+import argparse
+import hashlib
+import json
 import os
 import re
+import time
 import urllib.parse
-from bs4 import BeautifulSoup
-from pypinyin import pinyin, Style
+from functools import partial
+from html.parser import HTMLParser
+import build_stats
+import pinyin_cache
+from build_stats import stats
+from file_writer import FileWriter, original_name, write_if_changed
+from pinyin_cache import title_pinyin
+import concordance
+import file_writer
+import highlighter
+import listings
+import search_index
+import static_assets
+import templates
+import validate as validation
+from concordance import CONCORDANCE_DIR, build_concordance
+from listings import LISTING_DIR, build_listings
+from search_index import SEARCH_DIR, build_search_files, strip_tones
+from templates import Markup, Template, escape
+from validate import ValidationError, print_summary, validate
 
 # --- CONFIGURATION ---
 ROOT_DIR = os.getcwd()
@@ -13,125 +35,308 @@ IMAGES_DIR = os.path.join(ROOT_DIR, "assets", "images")
 WEB_SONG_PREFIX = "songs/"
 WEB_IMG_PREFIX = "assets/images/"
 
-html_head = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Chinese Song Library</title>
-    <style>
-        :root {
-            --bg-color: #121212;
-            --card-bg: #181818;
-            --card-hover: #282828;
-            --text-main: #ffffff;
-            --text-sub: #b3b3b3;
-            --accent: #1db954;
-        }
-        body {
-            font-family: "Circular", -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
-            background-color: var(--bg-color);
-            color: var(--text-main);
-            margin: 0;
-            padding: 20px;
-            line-height: 1.5;
-        }
-        .container { max-width: 1200px; margin: 0 auto; padding-bottom: 50px; }
-        
-        header { display: flex; flex-direction: column; align-items: center; margin-bottom: 40px; padding-top: 20px; }
-        h1 { font-size: 3em; margin-bottom: 10px; letter-spacing: -1px; text-align: center; }
-        p.subtitle { color: var(--text-sub); font-size: 1.1em; margin-bottom: 30px; }
-
-        /* Search */
-        .search-container { position: relative; width: 100%; max-width: 500px; }
-        #searchInput {
-            width: 100%; padding: 15px 25px; border-radius: 50px;
-            border: 1px solid #333; background-color: #2a2a2a; color: white;
-            font-size: 1.1em; outline: none; transition: 0.3s; box-sizing: border-box;
-        }
-        #searchInput:focus { border-color: var(--accent); background-color: #333; }
-
-        /* Grid */
-        .song-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(200px, 1fr));
-            gap: 24px;
-            margin-top: 20px;
-        }
+# Resized cover variants written by build_images.py (optional)
+VARIANTS_MANIFEST = os.path.join(IMAGES_DIR, "variants", "manifest.json")
+WEB_VARIANT_PREFIX = WEB_IMG_PREFIX + "variants/"
+CARD_IMG_SIZES = "(max-width: 480px) calc(100vw - 72px), 240px"
 
-        /* Cards */
-        .song-card {
-            background: var(--card-bg);
-            border-radius: 8px;
-            padding: 16px;
-            text-decoration: none;
-            color: inherit;
-            transition: background-color 0.3s ease;
-            display: flex;
-            flex-direction: column;
-            position: relative;
-        }
-        .song-card:hover { background-color: var(--card-hover); }
+# Only the first page of cards is written into index.html; the rest are
+# rendered in the browser from catalogue.json as the user scrolls or searches.
+# The static listings in browse/ (see listings.py) use the same page size.
+CATALOGUE_FILE = "catalogue.json"
+CARDS_PER_PAGE = 48
 
-        .card-img-box {
-            width: 100%; aspect-ratio: 1 / 1;
-            border-radius: 6px; overflow: hidden; margin-bottom: 12px;
-            position: relative; box-shadow: 0 8px 24px rgba(0,0,0,0.5);
-            background: #333;
-        }
-        .card-img-box img {
-            width: 100%; height: 100%; object-fit: cover;
-            transition: transform 0.3s ease;
-        }
-        .song-card:hover .card-img-box img { transform: scale(1.05); }
-
-        /* Genre Pill - UPDATED LAYOUT */
-        .genre-pill {
-            /* Positioned relative to flow, not absolute over image */
-            display: inline-block;
-            font-size: 0.65em;
-            font-weight: 700;
-            text-transform: uppercase;
-            letter-spacing: 0.05em;
-            margin-bottom: 6px; /* Space between pill and title */
-            
-            /* Visual Style: Outlined Accent */
-            color: #ffb74d;
-            border: 1px solid rgba(255, 183, 77, 0.3);
-            background: rgba(255, 183, 77, 0.1); 
-            padding: 2px 8px;
-            border-radius: 4px;
-            align-self: flex-start;
-            width: fit-content;
-        }
+# Incremental build cache: remembers what was extracted from each song page
+# so unchanged files are never re-parsed. Bump CACHE_VERSION whenever
+# extract_metadata() starts returning something different.
+CACHE_DIR = os.path.join(ROOT_DIR, ".build_cache")
+CACHE_FILE = os.path.join(CACHE_DIR, "index_manifest.json")
+CACHE_VERSION = 3
 
-        /* Play Button Overlay */
-        .play-overlay {
-            position: absolute; bottom: 8px; right: 8px;
-            width: 48px; height: 48px; border-radius: 50%;
-            background-color: var(--accent);
-            box-shadow: 0 4px 12px rgba(0,0,0,0.4);
-            display: flex; align-items: center; justify-content: center;
-            opacity: 0; transform: translateY(8px); transition: all 0.3s ease;
-            z-index: 2;
-        }
-        .play-overlay::after { content: "▶"; font-size: 1.2em; color: black; margin-left: 2px; }
-        .song-card:hover .play-overlay { opacity: 1; transform: translateY(0); }
+# Song pages and cover images are both named "N.something"
+SONG_NUMBER_PATTERN = re.compile(r'^(\d+)\.')
+
+# Shared by every build of the library page, so they are published as
+# content-hashed files (see static_assets) instead of being inlined.
+INDEX_CSS = """:root {
+    --bg-color: #121212;
+    --card-bg: #181818;
+    --card-hover: #282828;
+    --text-main: #ffffff;
+    --text-sub: #b3b3b3;
+    --accent: #1db954;
+}
+body {
+    font-family: "Circular", -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
+    background-color: var(--bg-color);
+    color: var(--text-main);
+    margin: 0;
+    padding: 20px;
+    line-height: 1.5;
+}
+.container { max-width: 1200px; margin: 0 auto; padding-bottom: 50px; }
+
+header { display: flex; flex-direction: column; align-items: center; margin-bottom: 40px; padding-top: 20px; }
+h1 { font-size: 3em; margin-bottom: 10px; letter-spacing: -1px; text-align: center; }
+p.subtitle { color: var(--text-sub); font-size: 1.1em; margin-bottom: 30px; }
+
+/* Search */
+.search-container { position: relative; width: 100%; max-width: 500px; }
+#searchInput {
+    width: 100%; padding: 15px 25px; border-radius: 50px;
+    border: 1px solid #333; background-color: #2a2a2a; color: white;
+    font-size: 1.1em; outline: none; transition: 0.3s; box-sizing: border-box;
+}
+#searchInput:focus { border-color: var(--accent); background-color: #333; }
+
+/* Grid */
+.song-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(200px, 1fr));
+    gap: 24px;
+    margin-top: 20px;
+}
+
+/* Cards */
+.song-card {
+    background: var(--card-bg);
+    border-radius: 8px;
+    padding: 16px;
+    text-decoration: none;
+    color: inherit;
+    transition: background-color 0.3s ease;
+    display: flex;
+    flex-direction: column;
+    position: relative;
+}
+.song-card:hover { background-color: var(--card-hover); }
+
+.card-img-box {
+    width: 100%; aspect-ratio: 1 / 1;
+    border-radius: 6px; overflow: hidden; margin-bottom: 12px;
+    position: relative; box-shadow: 0 8px 24px rgba(0,0,0,0.5);
+    background: #333;
+}
+.card-img-box img {
+    width: 100%; height: 100%; object-fit: cover;
+    transition: transform 0.3s ease;
+}
+.song-card:hover .card-img-box img { transform: scale(1.05); }
+
+/* Genre Pill - UPDATED LAYOUT */
+.genre-pill {
+    /* Positioned relative to flow, not absolute over image */
+    display: inline-block;
+    font-size: 0.65em;
+    font-weight: 700;
+    text-transform: uppercase;
+    letter-spacing: 0.05em;
+    margin-bottom: 6px; /* Space between pill and title */
 
-        /* Text Info */
-        .song-title {
-            font-size: 1.1em; font-weight: 700; color: var(--text-main);
-            margin: 0 0 2px 0; white-space: nowrap; overflow: hidden; text-overflow: ellipsis;
+    /* Visual Style: Outlined Accent */
+    color: #ffb74d;
+    border: 1px solid rgba(255, 183, 77, 0.3);
+    background: rgba(255, 183, 77, 0.1); 
+    padding: 2px 8px;
+    border-radius: 4px;
+    align-self: flex-start;
+    width: fit-content;
+}
+
+/* Play Button Overlay */
+.play-overlay {
+    position: absolute; bottom: 8px; right: 8px;
+    width: 48px; height: 48px; border-radius: 50%;
+    background-color: var(--accent);
+    box-shadow: 0 4px 12px rgba(0,0,0,0.4);
+    display: flex; align-items: center; justify-content: center;
+    opacity: 0; transform: translateY(8px); transition: all 0.3s ease;
+    z-index: 2;
+}
+.play-overlay::after { content: "▶"; font-size: 1.2em; color: black; margin-left: 2px; }
+.song-card:hover .play-overlay { opacity: 1; transform: translateY(0); }
+
+/* Text Info */
+.song-title {
+    font-size: 1.1em; font-weight: 700; color: var(--text-main);
+    margin: 0 0 2px 0; white-space: nowrap; overflow: hidden; text-overflow: ellipsis;
+}
+.song-pinyin {
+    font-size: 0.85em; color: #ffd54f; font-weight: 500; margin-bottom: 4px;
+}
+.song-artist {
+    font-size: 0.9em; color: var(--text-sub); margin: 0;
+    white-space: nowrap; overflow: hidden; text-overflow: ellipsis;
+}
+.footer { text-align: center; margin-top: 60px; color: #555; font-size: 0.8em; }
+
+/* Listing pages (browse/) */
+.crumbs a, .pager a, .facet-list a { color: var(--text-sub); text-decoration: none; }
+.crumbs a:hover, .pager a:hover, .facet-list a:hover { color: var(--accent); }
+.pager { display: flex; justify-content: center; gap: 20px; margin-top: 40px; color: var(--text-sub); }
+h2 { margin: 40px 0 15px; font-size: 1.4em; }
+.facet-list { display: flex; flex-wrap: wrap; gap: 8px; }
+.facet-list a { background: var(--card-bg); border-radius: 50px; padding: 6px 14px; font-size: 0.9em; }
+.facet-list a span { color: #555; margin-left: 4px; }
+"""
+
+INDEX_JS = """// Cards past the first page and search results are rendered from
+// catalogue.json (written by build_index.py) instead of scanning the DOM.
+const PAGE_SIZE = 48; // keep in sync with CARDS_PER_PAGE in build_index.py
+const searchInput = document.getElementById('searchInput');
+const songGrid = document.getElementById('songGrid');
+const sentinel = document.getElementById('gridEnd');
+
+let catalogue = null;   // {songs: [...], search: [...]}
+let matches = [];       // indexes into catalogue.songs for the current query
+let rendered = songGrid.children.length;
+
+function normalize(text) {
+    return text.toLowerCase().normalize('NFD').replace(/\p{M}/gu, '');
+}
+
+function esc(text) {
+    return String(text).replace(/[&<>"]/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c]));
+}
+
+function renderCover(s) {
+    if (!s.srcset) {
+        return `<img src="${s.img}" alt="${esc(s.title)}" loading="lazy">`;
+    }
+    const sources = s.sources.map(([type, srcset]) =>
+        `<source type="${type}" srcset="${srcset}" sizes="${catalogue.sizes}">`).join('');
+    return `<picture>${sources}<img src="${s.img}" srcset="${s.srcset}" sizes="${catalogue.sizes}" ` +
+        `width="${s.w}" height="${s.h}" alt="${esc(s.title)}" loading="lazy"></picture>`;
+}
+
+function renderCard(s) {
+    return `<a href="${s.url}" class="song-card">
+        <div class="card-img-box">${renderCover(s)}<div class="play-overlay"></div></div>
+        <span class="genre-pill">${esc(s.genre)}</span>
+        <div class="song-title">${esc(s.title)}</div>
+        <div class="song-pinyin">${esc(s.pinyin)}</div>
+        <p class="song-artist">${esc(s.artist)}</p>
+    </a>`;
+}
+
+function renderMore() {
+    if (!catalogue || rendered >= matches.length) return;
+    const next = matches.slice(rendered, rendered + PAGE_SIZE);
+    songGrid.insertAdjacentHTML('beforeend', next.map(i => renderCard(catalogue.songs[i])).join(''));
+    rendered += next.length;
+}
+
+function runSearch() {
+    const terms = normalize(searchInput.value).split(/\s+/).filter(Boolean);
+    if (!catalogue) {
+        // catalogue.json unavailable (e.g. opened from disk): filter the static cards
+        for (const card of songGrid.children) {
+            const text = normalize(card.innerText);
+            card.style.display = terms.every(t => text.includes(t)) ? "" : "none";
         }
-        .song-pinyin {
-            font-size: 0.85em; color: #ffd54f; font-weight: 500; margin-bottom: 4px;
+        return;
+    }
+    matches = [];
+    catalogue.search.forEach((text, i) => {
+        if (terms.every(t => text.includes(t))) matches.push(i);
+    });
+    showMatches();
+
+    // Songs whose lyrics or vocab contain the query are added when their shards arrive
+    const query = searchInput.value;
+    searchLyrics(query).then(found => {
+        if (searchInput.value !== query) return;
+        const extra = found.filter(i => !matches.includes(i));
+        if (extra.length) {
+            matches = matches.concat(extra).sort((a, b) => a - b);
+            showMatches();
         }
-        .song-artist {
-            font-size: 0.9em; color: var(--text-sub); margin: 0;
-            white-space: nowrap; overflow: hidden; text-overflow: ellipsis;
+    });
+}
+
+function showMatches() {
+    songGrid.innerHTML = '';
+    rendered = 0;
+    renderMore();
+}
+
+// --- Lyrics search (index shards written by search_index.py) ---
+const shardCache = new Map();
+let searchMeta = null;
+
+function shardOf(token, numShards) {
+    // 32-bit FNV-1a over code points, same as shard_of() in search_index.py
+    let h = 0x811c9dc5;
+    for (const ch of token) {
+        h ^= ch.codePointAt(0);
+        h = Math.imul(h, 16777619) >>> 0;
+    }
+    return h % numShards;
+}
+
+function queryTokens(text) {
+    const tokens = [];
+    for (const run of text.match(/[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+/g) || []) {
+        if (run.length === 1) tokens.push(run);
+        for (let i = 0; i + 1 < run.length; i++) tokens.push(run.slice(i, i + 2));
+    }
+    tokens.push(...(normalize(text).match(/[a-z0-9]+/g) || []));
+    return [...new Set(tokens)];
+}
+
+function loadShard(n) {
+    if (!shardCache.has(n)) {
+        shardCache.set(n, fetch(`search/${n}.json`).then(r => r.json()).catch(() => ({})));
+    }
+    return shardCache.get(n);
+}
+
+async function searchLyrics(text) {
+    const tokens = queryTokens(text);
+    if (!tokens.length) return [];
+    if (!searchMeta) {
+        searchMeta = await fetch('search/meta.json').then(r => r.json()).catch(() => ({shards: 0}));
+    }
+    if (!searchMeta.shards) return [];
+
+    // Every token must occur in the same lyric row / vocab card
+    let lines = null;
+    for (const token of tokens) {
+        const shard = await loadShard(shardOf(token, searchMeta.shards));
+        const found = new Set();
+        for (const [song, ...lineNos] of Object.hasOwn(shard, token) ? shard[token] : []) {
+            for (const line of lineNos) found.add(song + ':' + line);
         }
-        .footer { text-align: center; margin-top: 60px; color: #555; font-size: 0.8em; }
-    </style>
+        lines = lines === null ? found : new Set([...lines].filter(key => found.has(key)));
+        if (!lines.size) return [];
+    }
+    return [...new Set([...lines].map(key => Number(key.split(':')[0])))];
+}
+
+searchInput.addEventListener('input', runSearch);
+
+// Append the next page of cards whenever the end of the grid scrolls into view
+new IntersectionObserver(entries => {
+    if (entries[0].isIntersecting) renderMore();
+}, {rootMargin: '600px'}).observe(sentinel);
+
+fetch('catalogue.json')
+    .then(response => response.json())
+    .then(data => {
+        catalogue = data;
+        matches = data.songs.map((_, i) => i);
+        if (searchInput.value) runSearch(); else renderMore();
+    })
+    .catch(() => {});
+"""
+
+html_head = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Chinese Song Library</title>
+    <link rel="stylesheet" href="{css_url}">
 </head>
 <body>
 <div class="container">
@@ -144,49 +349,209 @@ html_head = """<!DOCTYPE html>
         <div class="tools" style="margin-top: 15px; font-size: 0.9em;">
              <a href="https://www.mdbg.net/chinese/dictionary" target="_blank" style="color:#b3b3b3; text-decoration:none; margin: 0 10px;">📖 Dictionary</a>
              <a href="https://translate.google.com/" target="_blank" style="color:#b3b3b3; text-decoration:none; margin: 0 10px;">G-Translate</a>
+             <a href="browse/index.html" style="color:#b3b3b3; text-decoration:none; margin: 0 10px;">🗂️ Browse</a>
         </div>
     </header>
     <div class="song-grid" id="songGrid">
-"""
+""")
 
-html_footer = """
+html_footer = Template("""
     </div>
+    <div id="gridEnd"></div>
     <div class="footer"><p>Auto-generated by build_index.py</p></div>
 </div>
 
-<script>
-    const searchInput = document.getElementById('searchInput');
-    const songGrid = document.getElementById('songGrid');
-    const cards = songGrid.getElementsByClassName('song-card');
-
-    searchInput.addEventListener('keyup', function() {
-        const filter = searchInput.value.toLowerCase();
-        for (let i = 0; i < cards.length; i++) {
-            const card = cards[i];
-            const text = card.innerText.toLowerCase();
-            if (text.indexOf(filter) > -1) {
-                card.style.display = "";
-            } else {
-                card.style.display = "none";
-            }
-        }
-    });
-</script>
+<script src="{js_url}"></script>
 </body>
 </html>
-"""
+""")
 
-def extract_metadata(filepath):
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f, 'html.parser')
+# Tags that never get a closing tag, so they must not be pushed on the stack
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input",
+             "link", "meta", "source", "track", "wbr"}
+SCAN_CHUNK_SIZE = 8192
+
+# Text collected for the lyrics search index; each .lyric-row or .vocab-card
+# becomes one searchable line
+LINE_CLASSES = {"hanzi-line", "pinyin-line", "eng-line",
+                "target-word", "target-pinyin", "target-meaning", "cn-sent", "en-sent"}
+GROUP_CLASSES = {"lyric-row", "vocab-card"}
+# Line texts that are also kept on their own (for the concordance and validation)
+LINE_ROLES = {"target-word": "word", "hanzi-line": "hanzi", "pinyin-line": "pinyin"}
+
+class SongScanner(HTMLParser):
+    """Streams a song page and collects the hero fields (and optionally lyric text).
+
+    Equivalent to selecting '.hero-text h1', '.hero-text p' and '.tag-pill'
+    with BeautifulSoup, but no tree is built and the caller can stop feeding
+    the file as soon as `done` is set (the hero comes before the vocab and
+    lyrics, so most of the page is never read). With collect_lines=True the
+    whole page is read and `lines` gets the text of every lyric row and
+    vocab card, `vocab` the .target-word of every card, `lyrics` the
+    .hanzi-line of every row (with the index of its group in `lines`) and
+    `empty_pinyin` the (1-based) lyric rows whose .pinyin-line is blank.
+    """
+    FIELDS = ("title", "subtitle", "genre")
+
+    def __init__(self, collect_lines=False):
+        super().__init__(convert_charrefs=True)
+        self.collect_lines = collect_lines
+        self.stack = []       # [tag, is_hero_text] for every open element
+        self.hero_depth = 0   # how many open elements carry .hero-text
+        self.capturing = []   # [field or None for line text, stack depth, text parts, line role]
+        self.fields = {}
+        self.lines = []       # one list of strings per lyric row / vocab card
+        self.vocab = []       # vocab card words
+        self.lyrics = []      # (group index, Hanzi lyric line)
+        self.rows = 0         # lyric rows seen so far
+        self.empty_pinyin = []
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        classes = (dict(attrs).get("class") or "").split()
+        in_hero = self.hero_depth > 0
 
-        title_tag = soup.select_one('.hero-text h1')
-        title = title_tag.text.strip() if title_tag else "Unknown Title"
+        if tag in VOID_TAGS:
+            return
+        is_hero = "hero-text" in classes
+        self.stack.append([tag, is_hero])
+        if is_hero:
+            self.hero_depth += 1
 
-        subtitle_tag = soup.select_one('.hero-text p')
-        full_subtitle = subtitle_tag.text.strip() if subtitle_tag else ""
+        field = None
+        if in_hero and tag == "h1":
+            field = "title"
+        elif in_hero and tag == "p":
+            field = "subtitle"
+        elif "tag-pill" in classes:
+            field = "genre"
+        if field and field not in self.fields and not any(c[0] == field for c in self.capturing):
+            self.capturing.append([field, len(self.stack), [], None])
+
+        if self.collect_lines:
+            if GROUP_CLASSES.intersection(classes):
+                self.lines.append([])
+            if "lyric-row" in classes:
+                self.rows += 1
+            if LINE_CLASSES.intersection(classes):
+                role = next((LINE_ROLES[c] for c in classes if c in LINE_ROLES), None)
+                self.capturing.append([None, len(self.stack), [], role])
+
+    def handle_startendtag(self, tag, attrs):
+        # <div/> style tags have no content, so only the stack bookkeeping matters
+        if tag not in VOID_TAGS:
+            self.handle_starttag(tag, attrs)
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        # Pop up to the matching open tag, tolerating unclosed children
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > i:
+            _, is_hero = self.stack.pop()
+            if is_hero:
+                self.hero_depth -= 1
+        self._finish_captures()
+
+    def handle_data(self, data):
+        for capture in self.capturing:
+            capture[2].append(data)
+
+    def _finish_captures(self, force=False):
+        still_open = []
+        for field, depth, parts, role in self.capturing:
+            if not (force or len(self.stack) < depth):
+                still_open.append([field, depth, parts, role])
+            elif field:
+                self.fields[field] = "".join(parts).strip()
+            else:
+                text = " ".join("".join(parts).split())
+                # "..." is what build_pages.py writes when pypinyin is missing
+                if role == "pinyin" and not text.strip(".… "):
+                    self.empty_pinyin.append(self.rows)
+                if text:
+                    if not self.lines:
+                        self.lines.append([])
+                    self.lines[-1].append(text)
+                    if role == "word":
+                        self.vocab.append(text)
+                    elif role == "hanzi":
+                        self.lyrics.append((len(self.lines) - 1, text))
+        self.capturing = still_open
+        self.done = not self.collect_lines and all(f in self.fields for f in self.FIELDS)
+
+    def close(self):
+        super().close()
+        self._finish_captures(force=True)
+
+def scan_song(filepath, collect_lines=False):
+    """Fast path: read the page in chunks, stopping early once the hero fields are found.
+
+    With collect_lines, fields also gets "vocab" (the card words) and
+    "lyrics" ([line, Hanzi text] pairs, line indexing the returned lines).
+    """
+    scanner = SongScanner(collect_lines)
+    with open(filepath, 'r', encoding='utf-8') as f:
+        while not scanner.done:
+            chunk = f.read(SCAN_CHUNK_SIZE)
+            if not chunk:
+                scanner.close()
+                break
+            scanner.feed(chunk)
+    groups = [i for i, group in enumerate(scanner.lines) if group]
+    if collect_lines:
+        position = {group: line for line, group in enumerate(groups)}
+        scanner.fields["vocab"] = scanner.vocab
+        scanner.fields["lyrics"] = [[position[group], text] for group, text in scanner.lyrics]
+        scanner.fields["empty_pinyin"] = scanner.empty_pinyin
+    return scanner.fields, [" ".join(scanner.lines[group]) for group in groups]
+
+def soup_hero(filepath):
+    """Slow path: full BeautifulSoup parse, used when the scanner finds no title."""
+    from bs4 import BeautifulSoup
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        soup = BeautifulSoup(f, 'html.parser')
+
+    fields = {}
+    for field, selector in (("title", '.hero-text h1'),
+                            ("subtitle", '.hero-text p'),
+                            ("genre", '.tag-pill')):
+        tag = soup.select_one(selector)
+        if tag:
+            fields[field] = tag.text.strip()
+    return fields
+
+CARD_TEMPLATE = Template("""
+    <a href="{url}" class="song-card">
+        <!-- 1. Image first -->
+        <div class="card-img-box">
+            {cover}
+            <div class="play-overlay"></div>
+        </div>
         
+        <!-- 2. Genre second (Moved here so it doesn't cover the art) -->
+        <span class="genre-pill">{genre}</span>
+        
+        <!-- 3. Text Info -->
+        <div class="song-title">{title}</div>
+        <div class="song-pinyin">{pinyin}</div>
+        <p class="song-artist">{artist}</p>
+    </a>
+    """)
+
+def extract_metadata(filepath, collect_lines=False):
+    try:
+        fields, lines = scan_song(filepath, collect_lines)
+        if "title" not in fields:
+            fields = soup_hero(filepath)
+
+        title = fields.get("title", "Unknown Title")
+        full_subtitle = fields.get("subtitle", "")
+
         if "—" in full_subtitle:
             parts = full_subtitle.split("—")
             artist = parts[-1].strip()
@@ -196,108 +561,495 @@ def extract_metadata(filepath):
         else:
             artist = full_subtitle 
 
-        genre_tag = soup.select_one('.tag-pill')
-        genre = genre_tag.text.strip() if genre_tag else "Song"
+        genre = fields.get("genre", "Song")
 
         # Generate Pinyin
-        raw_pinyin = pinyin(title, style=Style.TONE)
-        pinyin_str = ' '.join([x[0].capitalize() for x in raw_pinyin])
+        pinyin_str = title_pinyin(title)
 
-        return {
+        meta = {
             "title": title,
             "artist": artist,
             "genre": genre,
-            "pinyin": pinyin_str
+            "pinyin": pinyin_str,
+            # Hero fields that fell back to a default, for validate.py
+            "missing": [f for f in SongScanner.FIELDS if not fields.get(f)],
         }
+        if collect_lines:
+            meta["lines"] = lines
+            meta["vocab"] = fields.get("vocab", [])
+            meta["lyrics"] = fields.get("lyrics", [])
+            meta["empty_pinyin"] = fields.get("empty_pinyin", [])
+        return meta
 
     except Exception as e:
         print(f"⚠️ Error parsing {filepath}: {e}")
         return None
 
-def find_matching_image(song_number):
+def file_digest(filepath):
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def load_cache():
+    """Return (file entries, outputs_key of the last completed build)."""
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}, None
+    if data.get("version") != CACHE_VERSION:
+        return {}, None
+    return data.get("files", {}), data.get("outputs_key")
+
+def save_cache(entries, outputs_key=None):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    text = json.dumps({"version": CACHE_VERSION, "outputs_key": outputs_key, "files": entries},
+                      ensure_ascii=False)
+    write_if_changed(CACHE_FILE, text.encode("utf-8"))
+
+def cached_metadata(filepath, filename, cache, new_cache, need_lines=False):
+    """Return the cached meta for an unchanged song page, or None if it must be parsed.
+
+    mtime + size is checked first so an untouched file is never even read;
+    if those differ the content hash decides (e.g. after a fresh git checkout).
+    The entry for this run is recorded in new_cache either way. Entries cached
+    without lyric lines count as misses when need_lines is set.
+    """
+    st = os.stat(filepath)
+    entry = cache.get(filename)
+    if entry and need_lines and "lines" not in entry["meta"]:
+        entry = None
+    if entry and entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size:
+        new_cache[filename] = entry
+        return entry["meta"]
+
+    digest = file_digest(filepath)
+    new_cache[filename] = {
+        "mtime": st.st_mtime_ns,
+        "size": st.st_size,
+        "hash": digest,
+        "meta": entry["meta"] if entry and entry["hash"] == digest else None,
+    }
+    return new_cache[filename]["meta"]
+
+def timed_extract(filepath, collect_lines=False):
+    """extract_metadata() plus the seconds it took (measured in the worker)."""
+    start = time.perf_counter()
+    meta = extract_metadata(filepath, collect_lines)
+    return meta, time.perf_counter() - start
+
+def extract_all(filepaths, jobs=1, collect_lines=False):
+    """Run extract_metadata() over many pages, optionally in worker processes.
+
+    Returns (meta, seconds) pairs in the same order as filepaths. jobs=0
+    means one worker per CPU core.
+    """
+    extract = partial(timed_extract, collect_lines=collect_lines)
+    if jobs == 1 or len(filepaths) < 2:
+        return [extract(path) for path in filepaths]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = jobs or os.cpu_count() or 1
+    chunksize = max(1, len(filepaths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(extract, filepaths, chunksize=chunksize))
+
+def build_image_index():
+    """Map song number -> cover image filename with a single scan of IMAGES_DIR.
+
+    Images follow the same "N.name" convention as the song pages. If several
+    images share a number the first one by name wins and the clash is reported.
+    """
+    index = {}
+    duplicates = {}
     try:
-        if not os.path.exists(IMAGES_DIR):
-             return None
-             
-        available_images = os.listdir(IMAGES_DIR)
-        for img in available_images:
-            if img.startswith(f"{song_number}."):
-                return img
+        with os.scandir(IMAGES_DIR) as entries:
+            names = sorted(entry.name for entry in entries if entry.is_file())
     except FileNotFoundError:
         print("❌ Error: Could not find assets/images folder.")
-    return None
+        return index
 
-# --- MAIN LOGIC ---
+    for name in names:
+        match = SONG_NUMBER_PATTERN.match(name)
+        if not match:
+            continue
+        num = int(match.group(1))
+        if num in index:
+            duplicates.setdefault(num, [index[num]]).append(name)
+        else:
+            index[num] = name
 
-if not os.path.exists(SONGS_DIR):
-    print(f"❌ Error: The folder '{SONGS_DIR}' does not exist.")
-    exit()
+    for num, dupes in sorted(duplicates.items()):
+        print(f"⚠️ Several images for song {num}: {', '.join(dupes)} (using {dupes[0]})")
+    return index
 
-files = os.listdir(SONGS_DIR)
-songs = []
-pattern = re.compile(r'^(\d+)\.')
+def load_image_variants():
+    """Read the build_images.py manifest (cover filename -> variants), if present."""
+    try:
+        with open(VARIANTS_MANIFEST, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-print(f"📂 Scanning '{SONGS_DIR}' for songs...")
+def cover_data(song):
+    """Image attributes for a card: src, plus srcsets when resized variants exist."""
+    variants = song.get("variants")
+    if not variants:
+        return {"img": song["img"]}
+
+    def srcset(entries):
+        return ", ".join(f"{WEB_VARIANT_PREFIX}{urllib.parse.quote(name)} {width}w"
+                         for name, width, _ in entries)
+
+    # JPEG is the <img> fallback; everything else becomes a <source>
+    fallback = variants["variants"]["jpg"]
+    default_name, default_w, default_h = next(
+        (v for v in fallback if v[1] >= 400), fallback[-1])
+
+    return {
+        "img": WEB_VARIANT_PREFIX + urllib.parse.quote(default_name),
+        "srcset": srcset(fallback),
+        "w": default_w,
+        "h": default_h,
+        "sources": [[f"image/{ext}", srcset(entries)]
+                    for ext, entries in variants["variants"].items() if ext != "jpg"],
+    }
+
+def cover_html(song):
+    """<img> for a card, or a <picture> with srcsets when resized variants exist."""
+    cover = cover_data(song)
+    if "srcset" not in cover:
+        return Markup(f'<img src="{cover["img"]}" alt="{escape(song["title"])}" loading="lazy">')
+
+    sources = "".join(f'<source type="{mime}" srcset="{srcset}" sizes="{CARD_IMG_SIZES}">'
+                      for mime, srcset in cover["sources"])
+    return Markup(f'<picture>{sources}'
+                  f'<img src="{cover["img"]}" srcset="{cover["srcset"]}" sizes="{CARD_IMG_SIZES}" '
+                  f'width="{cover["w"]}" height="{cover["h"]}" '
+                  f'alt="{escape(song["title"])}" loading="lazy"></picture>')
+
+def search_text(song):
+    """Everything a query can match for one song, lowercased and without tone marks.
+
+    Pinyin is included spaced, unspaced and as initials, so '森林', 'sen lin',
+    'senlin' and 'sl' all find 挪威的森林.
+    """
+    toneless = strip_tones(song["pinyin"].lower())
+    initials = "".join(word[0] for word in toneless.split())
+    fields = [song["title"], song["artist"], song["genre"],
+              toneless, toneless.replace(" ", ""), initials]
+    return strip_tones("\n".join(fields).lower())
+
+def build_catalogue(songs):
+    """Compact JSON for the library page: card data plus a parallel search index."""
+    entries = []
+    for song in songs:
+        entry = {
+            "url": song["filename"],
+            "title": song["title"],
+            "pinyin": song["pinyin"],
+            "artist": song["artist"],
+            "genre": song["genre"],
+        }
+        entry.update(cover_data(song))
+        entries.append(entry)
+
+    catalogue = {
+        "sizes": CARD_IMG_SIZES,
+        "songs": entries,
+        "search": [search_text(song) for song in songs],
+    }
+    return json.dumps(catalogue, ensure_ascii=False, separators=(",", ":"))
+
+def source_digest():
+    """Hash of the code that shapes (or checks) the outputs, so editing it forces a rebuild."""
+    h = hashlib.sha256()
+    for module in (__file__, concordance.__file__, file_writer.__file__, highlighter.__file__,
+                   listings.__file__, search_index.__file__, static_assets.__file__, templates.__file__,
+                   validation.__file__):
+        h.update(file_digest(module).encode())
+    return h.hexdigest()
+
+def outputs_key(scanned, image_index):
+    """Fingerprint of everything the outputs are rendered from.
+
+    If it matches the key saved by the last build (and the outputs still
+    exist) there is nothing to do: no parsing, rendering or writing.
+    """
+    h = hashlib.sha256()
+    for file in scanned["files"]:
+        h.update(f"{file}\0{scanned['cache'][file]['hash']}\n".encode())
+    for num, name in sorted(image_index.items()):
+        h.update(f"{num}\0{name}\n".encode())
+    try:
+        st = os.stat(VARIANTS_MANIFEST)
+        h.update(f"{st.st_mtime_ns}:{st.st_size}".encode())
+    except OSError:
+        pass
+    h.update(f"{scanned['lyrics_index']}:{CARDS_PER_PAGE}:{source_digest()}".encode())
+    return h.hexdigest()
+
+# --- LIBRARY API ---
+# build_index can be driven in-process (e.g. from a watcher or a server)
+# instead of being run as a script:
+#
+#     import build_index
+#     build_index.build()                          # everything, with caching
+#
+#     scanned = build_index.scan()                 # or step by step
+#     songs = build_index.extract(scanned)
+#     build_index.write(build_index.render(songs))
+
+def scan(lyrics_index=True):
+    """List the song pages and resolve every unchanged one from the cache.
+
+    Returns a dict with the sorted file names, the cached metas, the files
+    that still need parsing and this run's cache entries (which extract()
+    completes and build() saves).
+    """
+    with stats.stage("scan"):
+        # Sorted so songs without a number still come out in a stable order
+        files = sorted(f for f in os.listdir(SONGS_DIR) if f.endswith(".html"))
+        cache, previous_key = load_cache()
+        new_cache = {}
+
+        metas = {}
+        to_parse = []
+        for file in files:
+            full_path = os.path.join(SONGS_DIR, file)
+            meta = cached_metadata(full_path, file, cache, new_cache, lyrics_index)
+            if meta:
+                metas[file] = meta
+            else:
+                to_parse.append(file)
+
+    stats.count("songs", len(files))
+    stats.count("cache_hits", len(files) - len(to_parse))
+    stats.count("files_parsed", len(to_parse))
+    return {
+        "files": files,
+        "metas": metas,
+        "to_parse": to_parse,
+        "cache": new_cache,
+        "previous_key": previous_key,
+        "lyrics_index": lyrics_index,
+    }
+
+def extract(scanned, jobs=1, image_index=None):
+    """Parse the changed pages and return every song, sorted by number, with its cover."""
+    files, metas, to_parse, new_cache = (scanned["files"], scanned["metas"],
+                                         scanned["to_parse"], scanned["cache"])
+
+    with stats.stage("parse"):
+        parsed = extract_all([os.path.join(SONGS_DIR, f) for f in to_parse], jobs,
+                             scanned["lyrics_index"])
+        for file, (meta, seconds) in zip(to_parse, parsed):
+            stats.file_time(os.path.join(SONGS_DIR, file), seconds)
+            if meta:
+                metas[file] = meta
+                new_cache[file]["meta"] = meta
+            else:
+                # Failed parses are not cached so they get retried next run
+                del new_cache[file]
+                stats.count("parse_errors")
+    print(f"♻️  {len(files) - len(to_parse)} cached, {len(to_parse)} parsed")
+
+    with stats.stage("images"):
+        if image_index is None:
+            image_index = build_image_index()
+        image_variants = load_image_variants()
+
+    songs = []
+    for file in files:
+        meta = metas.get(file)
+        if not meta:
+            continue
 
-for file in files:
-    if file.endswith(".html"):
-        full_path = os.path.join(SONGS_DIR, file)
-        
-        # Extract metadata
-        meta = extract_metadata(full_path)
-        
         # Get Sorting Number
-        match = pattern.match(file)
+        match = SONG_NUMBER_PATTERN.match(file)
         sort_num = int(match.group(1)) if match else 999
 
         # Find Image
-        found_image_filename = find_matching_image(sort_num)
-        
+        found_image_filename = image_index.get(sort_num)
+
         if found_image_filename:
             encoded_img_name = urllib.parse.quote(found_image_filename)
             full_img_path = WEB_IMG_PREFIX + encoded_img_name
         else:
-            full_img_path = "assets/images/default.png" 
+            full_img_path = "assets/images/default.png"
 
         # Create web-safe path for the song link
         encoded_song_name = urllib.parse.quote(file)
         song_web_link = WEB_SONG_PREFIX + encoded_song_name
 
-        if meta:
-            songs.append({
-                "num": sort_num,
-                "filename": song_web_link, 
-                "img": full_img_path,
-                **meta 
-            })
-
-# Sort by number
-songs.sort(key=lambda x: x["num"])
-
-# Generate HTML Cards
-cards_html = ""
-for song in songs:
-    card = f"""
-    <a href="{song['filename']}" class="song-card">
-        <!-- 1. Image first -->
-        <div class="card-img-box">
-            <img src="{song['img']}" alt="{song['title']}" loading="lazy">
-            <div class="play-overlay"></div>
-        </div>
-        
-        <!-- 2. Genre second (Moved here so it doesn't cover the art) -->
-        <span class="genre-pill">{song['genre']}</span>
-        
-        <!-- 3. Text Info -->
-        <div class="song-title">{song['title']}</div>
-        <div class="song-pinyin">{song['pinyin']}</div>
-        <p class="song-artist">{song['artist']}</p>
-    </a>
+        songs.append({
+            "num": sort_num,
+            "filename": song_web_link,
+            "img": full_img_path,
+            "variants": image_variants.get(found_image_filename),
+            **meta
+        })
+
+    # Sort by number
+    songs.sort(key=lambda x: x["num"])
+
+    return songs
+
+def render(songs, lyrics_index=True):
+    """Render every output file. Returns {relative path: text}."""
+    # Generate HTML Cards, once per song: index.html shows the first page and
+    # the browse/ listings reuse them (the rest of index.html comes from the catalogue)
+    with stats.stage("render"):
+        cards_html = [
+            CARD_TEMPLATE.render(
+                url=song['filename'], cover=cover_html(song), genre=song['genre'],
+                title=song['title'], pinyin=song['pinyin'], artist=song['artist'])
+            for song in songs
+        ]
+        css_path = static_assets.asset_path("index.css", INDEX_CSS)
+        js_path = static_assets.asset_path("index.js", INDEX_JS)
+        css_url = static_assets.url_from(ROOT_DIR, css_path)
+        outputs = {
+            "index.html": "".join([
+                html_head.render(css_url=css_url),
+                *cards_html[:CARDS_PER_PAGE],
+                html_footer.render(js_url=static_assets.url_from(ROOT_DIR, js_path)),
+            ]),
+            CATALOGUE_FILE: build_catalogue(songs),
+            css_path: INDEX_CSS,
+            js_path: INDEX_JS,
+        }
+
+    with stats.stage("listings"):
+        outputs.update(build_listings(songs, cards_html, CARDS_PER_PAGE, css_url))
+
+    if lyrics_index:
+        with stats.stage("search"):
+            outputs.update(build_search_files([song.get("lines", []) for song in songs]))
+        with stats.stage("concordance"):
+            outputs.update(build_concordance(songs))
+    return outputs
+
+def write(outputs):
+    """Write the outputs that changed, with .gz/.br siblings, and update the asset manifest.
+
+    Listing pages, search/concordance shards and asset versions left over
+    from older builds are removed. Returns the paths that were actually written.
     """
-    cards_html += card
+    with stats.stage("write"):
+        # Without a lyrics index this run, leave the one from the last full build alone
+        shard_dirs = {path.split("/")[0] for path in outputs
+                      if path.split("/")[0] in (LISTING_DIR, SEARCH_DIR, CONCORDANCE_DIR)}
+        for directory in shard_dirs | {static_assets.ASSETS_DIR}:
+            os.makedirs(directory, exist_ok=True)
+        with FileWriter(precompress=True) as writer:
+            for path, text in outputs.items():
+                writer.write(path, text)
+        for directory in shard_dirs:
+            for name in os.listdir(directory):
+                if f"{directory}/{original_name(name)}" not in outputs:
+                    os.remove(os.path.join(directory, name))
+                    stats.count("files_removed")
+        static_assets.prune_assets([path for path in outputs
+                                    if os.path.dirname(path) == static_assets.ASSETS_DIR])
+        static_assets.update_manifest(writer.published)
+    return writer.written
+
+def build(jobs=1, lyrics_index=True, force=False, strict=True):
+    """Bring index.html, catalogue.json, browse/, search/ and vocab/ up to date. Returns the paths written.
+
+    The pages are validated first (see validate.py); with strict, any problem
+    raises ValidationError before anything is written.
+    """
+    print(f"📂 Scanning '{SONGS_DIR}' for songs...")
+    scanned = scan(lyrics_index)
+    with stats.stage("images"):
+        image_index = build_image_index()
+    key = outputs_key(scanned, image_index)
+
+    outputs_exist = all(os.path.exists(path) for path in
+                        ["index.html", CATALOGUE_FILE, f"{LISTING_DIR}/index.html",
+                         static_assets.MANIFEST_FILE]
+                        + ([f"{SEARCH_DIR}/meta.json", f"{CONCORDANCE_DIR}/words.json"]
+                           if lyrics_index else []))
+    if not force and not scanned["to_parse"] and key == scanned["previous_key"] and outputs_exist:
+        print(f"✅ Nothing changed, index.html is up to date ({len(scanned['files'])} songs).")
+        return []
 
-# Write to index.html in the ROOT folder
-with open("index.html", "w", encoding="utf-8") as f:
-    f.write(html_head + cards_html + html_footer)
+    songs = extract(scanned, jobs, image_index)
+    with stats.stage("validate"):
+        problems = validate(scanned["files"], scanned["metas"], image_index)
+    stats.count("validation_problems", len(problems))
+    if problems:
+        print_summary(problems, fatal=strict)
+        if strict:
+            # Keep the parsed pages, but not the key: the next run must validate again
+            with stats.stage("write"):
+                save_cache(scanned["cache"])
+            raise ValidationError(problems)
+
+    outputs = render(songs, lyrics_index)
+    written = write(outputs)
+    with stats.stage("write"):
+        # Only a clean build may be skipped next time; after --allow-invalid the
+        # next (possibly strict) run must validate again
+        save_cache(scanned["cache"], None if problems else key)
+        pinyin_cache.save_cache()
+
+    if lyrics_index:
+        shards = sum(1 for path in outputs if path.startswith(SEARCH_DIR + "/")) - 1
+        updated = sum(1 for path in written if path.startswith(SEARCH_DIR + "/"))
+        print(f"🔎 Lyrics index: {shards} shard(s), {updated} file(s) updated")
+        shards = sum(1 for path in outputs if path.startswith(CONCORDANCE_DIR + "/")) - 1
+        updated = sum(1 for path in written if path.startswith(CONCORDANCE_DIR + "/"))
+        print(f"📚 Vocabulary concordance: {shards} shard(s), {updated} file(s) updated")
+    listing_pages = sum(1 for path in outputs if path.startswith(LISTING_DIR + "/"))
+    updated = sum(1 for path in written if path.startswith(LISTING_DIR + "/"))
+    print(f"🗂️  Listing pages: {listing_pages} page(s) in {LISTING_DIR}/, {updated} updated")
+    if "index.html" in written:
+        print(f"✅ Successfully generated index.html with {len(songs)} songs!")
+    else:
+        print(f"✅ index.html is already up to date ({len(songs)} songs).")
+
+    for name, value in pinyin_cache.cache_counters().items():
+        stats.count(name, value)
+    return written
+
+# --- MAIN LOGIC ---
+
+def job_count(value):
+    """argparse type for --jobs: a worker count, 0 meaning one per CPU core."""
+    jobs = int(value)
+    if jobs < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, not {jobs}")
+    return jobs
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate index.html from the pages in songs/.")
+    parser.add_argument("-j", "--jobs", type=job_count, default=1,
+                        help="parse song pages in N worker processes (0 = one per CPU core)")
+    parser.add_argument("--no-lyrics-index", dest="lyrics_index", action="store_false",
+                        help="skip the full-text lyrics search index (only the hero of each page is read)")
+    parser.add_argument("--force", action="store_true",
+                        help="render and compare every output even if nothing seems to have changed")
+    parser.add_argument("--allow-invalid", dest="strict", action="store_false",
+                        help="report validation problems as warnings instead of failing the build")
+    build_stats.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(SONGS_DIR):
+        print(f"❌ Error: The folder '{SONGS_DIR}' does not exist.")
+        exit()
+
+    try:
+        with build_stats.instrumented("build_index", args):
+            build(args.jobs, args.lyrics_index, args.force, args.strict)
+    except ValidationError:
+        print("❌ Nothing was written. Fix the pages above or run with --allow-invalid.")
+        exit(1)
 
-print(f"✅ Successfully generated index.html with {len(songs)} songs!")
+if __name__ == "__main__":
+    main()
@@ -1,75 +1,98 @@
+import argparse
+import json
 import os
+import re
+import time
+import urllib.parse
+import build_stats
+import static_assets
+from build_stats import stats
+from file_writer import FileWriter
+from highlighter import Highlighter, load_word_list, mark_line
+from pinyin_cache import HAS_PYPINYIN, batch_pinyin, cache_counters, line_pinyin, save_cache
+from templates import Markup, Template, escape
+if not HAS_PYPINYIN:
+    print("⚠️ 'pypinyin' not found. Pinyin will be missing unless manually added.")
 try:
-    from pypinyin import pinyin, Style
-    HAS_PYPINYIN = True
+    import tomllib
+    HAS_TOML = True
 except ImportError:
-    HAS_PYPINYIN = False
-    print("⚠️ 'pypinyin' not found. Pinyin will be missing unless manually added.")
+    HAS_TOML = False
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
 
 # ==========================================
 # 1. THE DESIGN (HTML TEMPLATE)
 # ==========================================
 # This applies the Dark Mode / Spotify style to ALL songs automatically.
-HTML_TEMPLATE = """<!DOCTYPE html>
+# The stylesheet is written once as a content-hashed file under assets/build
+# (see static_assets) and linked from every page.
+PAGE_CSS = """:root {
+  --bg-color: #121212;
+  --card-bg: #181818;
+  --text-main: #ffffff;
+  --text-sub: #b3b3b3;
+  --accent: #1db954;
+  --border-color: #282828;
+}
+body { font-family: "Circular", "Segoe UI", sans-serif; background-color: var(--bg-color); color: var(--text-main); line-height: 1.6; margin: 0; padding-bottom: 80px; }
+
+.nav-bar { background-color: rgba(18, 18, 18, 0.95); padding: 15px 20px; position: sticky; top: 0; z-index: 100; border-bottom: 1px solid var(--border-color); display: flex; align-items: center; backdrop-filter: blur(10px); }
+.back-btn { color: var(--text-sub); text-decoration: none; font-size: 0.9em; font-weight: bold; display: flex; align-items: center; }
+.back-btn:hover { color: var(--text-main); }
+.back-btn::before { content: "←"; margin-right: 8px; font-size: 1.2em; }
+
+.container { max-width: 900px; margin: 0 auto; padding: 20px; }
+.song-header { text-align: center; margin: 30px 0 40px 0; }
+h1 { font-size: 2.5em; margin-bottom: 5px; }
+.sub-header { color: var(--accent); font-size: 1.1em; font-weight: 500; }
+
+/* Tools */
+.tools-bar { display: flex; justify-content: center; gap: 15px; margin-top: 15px; }
+.tool-btn { background-color: var(--card-bg); border: 1px solid var(--border-color); color: var(--text-sub); padding: 8px 15px; border-radius: 20px; font-size: 0.85em; text-decoration: none; transition: 0.2s; }
+.tool-btn:hover { border-color: var(--accent); color: var(--accent); }
+
+h2.section-title { color: var(--text-main); font-size: 1.5em; margin-top: 50px; margin-bottom: 20px; border-bottom: 1px solid var(--border-color); padding-bottom: 10px; }
+
+/* Vocab Cards */
+.vocab-card { background: var(--card-bg); border-radius: 12px; margin-bottom: 25px; border: 1px solid var(--border-color); overflow: hidden; }
+.card-header { background: linear-gradient(90deg, rgba(29,185,84,0.1) 0%, rgba(24,24,24,0) 100%); padding: 15px 25px; border-left: 5px solid var(--accent); display: flex; justify-content: space-between; align-items: center; }
+.header-word { font-size: 1.5em; font-weight: 700; }
+.header-pinyin { color: var(--accent); margin-left: 10px; }
+.card-body { padding: 20px 25px; }
+.concept-row { display: flex; margin-bottom: 15px; border-bottom: 1px dashed #333; padding-bottom: 15px; }
+.concept-row:last-child { border-bottom: none; }
+.concept-label { width: 80px; color: var(--text-sub); font-size: 0.75em; text-transform: uppercase; }
+
+/* Lyrics Table */
+.lyrics-table { width: 100%; border-collapse: collapse; margin-top: 10px; }
+.lyrics-table th { text-align: left; color: var(--text-sub); font-size: 0.85em; padding: 10px 15px; border-bottom: 1px solid var(--border-color); }
+.lyrics-table tr:hover { background-color: #222; }
+.lyrics-table td { padding: 18px 15px; vertical-align: top; }
+.hanzi-lyric { font-size: 1.2em; font-weight: 500; width: 35%; }
+.pinyin-lyric { color: var(--accent); width: 30%; }
+.eng-lyric { color: var(--text-sub); font-size: 0.95em; width: 35%; }
+.highlight { color: #ffd54f; font-weight: bold; }
+.hsk { border-bottom: 1px dotted var(--text-sub); }
+
+@media (max-width: 600px) {
+  .lyrics-table th { display: none; }
+  .lyrics-table td { display: block; width: 100%; padding: 4px 15px; }
+  .hanzi-lyric { padding-top: 15px; }
+  .eng-lyric { padding-bottom: 15px; }
+}
+"""
+
+HTML_TEMPLATE = Template("""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8" />
     <meta name="viewport" content="width=device-width, initial-scale=1.0" />
     <title>{title_en} - Learning Mode</title>
-    <style>
-      :root {{
-        --bg-color: #121212;
-        --card-bg: #181818;
-        --text-main: #ffffff;
-        --text-sub: #b3b3b3;
-        --accent: #1db954;
-        --border-color: #282828;
-      }}
-      body {{ font-family: "Circular", "Segoe UI", sans-serif; background-color: var(--bg-color); color: var(--text-main); line-height: 1.6; margin: 0; padding-bottom: 80px; }}
-      
-      .nav-bar {{ background-color: rgba(18, 18, 18, 0.95); padding: 15px 20px; position: sticky; top: 0; z-index: 100; border-bottom: 1px solid var(--border-color); display: flex; align-items: center; backdrop-filter: blur(10px); }}
-      .back-btn {{ color: var(--text-sub); text-decoration: none; font-size: 0.9em; font-weight: bold; display: flex; align-items: center; }}
-      .back-btn:hover {{ color: var(--text-main); }}
-      .back-btn::before {{ content: "←"; margin-right: 8px; font-size: 1.2em; }}
-      
-      .container {{ max-width: 900px; margin: 0 auto; padding: 20px; }}
-      .song-header {{ text-align: center; margin: 30px 0 40px 0; }}
-      h1 {{ font-size: 2.5em; margin-bottom: 5px; }}
-      .sub-header {{ color: var(--accent); font-size: 1.1em; font-weight: 500; }}
-      
-      /* Tools */
-      .tools-bar {{ display: flex; justify-content: center; gap: 15px; margin-top: 15px; }}
-      .tool-btn {{ background-color: var(--card-bg); border: 1px solid var(--border-color); color: var(--text-sub); padding: 8px 15px; border-radius: 20px; font-size: 0.85em; text-decoration: none; transition: 0.2s; }}
-      .tool-btn:hover {{ border-color: var(--accent); color: var(--accent); }}
-
-      h2.section-title {{ color: var(--text-main); font-size: 1.5em; margin-top: 50px; margin-bottom: 20px; border-bottom: 1px solid var(--border-color); padding-bottom: 10px; }}
-      
-      /* Vocab Cards */
-      .vocab-card {{ background: var(--card-bg); border-radius: 12px; margin-bottom: 25px; border: 1px solid var(--border-color); overflow: hidden; }}
-      .card-header {{ background: linear-gradient(90deg, rgba(29,185,84,0.1) 0%, rgba(24,24,24,0) 100%); padding: 15px 25px; border-left: 5px solid var(--accent); display: flex; justify-content: space-between; align-items: center; }}
-      .header-word {{ font-size: 1.5em; font-weight: 700; }}
-      .header-pinyin {{ color: var(--accent); margin-left: 10px; }}
-      .card-body {{ padding: 20px 25px; }}
-      .concept-row {{ display: flex; margin-bottom: 15px; border-bottom: 1px dashed #333; padding-bottom: 15px; }}
-      .concept-row:last-child {{ border-bottom: none; }}
-      .concept-label {{ width: 80px; color: var(--text-sub); font-size: 0.75em; text-transform: uppercase; }}
-      
-      /* Lyrics Table */
-      .lyrics-table {{ width: 100%; border-collapse: collapse; margin-top: 10px; }}
-      .lyrics-table th {{ text-align: left; color: var(--text-sub); font-size: 0.85em; padding: 10px 15px; border-bottom: 1px solid var(--border-color); }}
-      .lyrics-table tr:hover {{ background-color: #222; }}
-      .lyrics-table td {{ padding: 18px 15px; vertical-align: top; }}
-      .hanzi-lyric {{ font-size: 1.2em; font-weight: 500; width: 35%; }}
-      .pinyin-lyric {{ color: var(--accent); width: 30%; }}
-      .eng-lyric {{ color: var(--text-sub); font-size: 0.95em; width: 35%; }}
-      
-      @media (max-width: 600px) {{
-        .lyrics-table th {{ display: none; }}
-        .lyrics-table td {{ display: block; width: 100%; padding: 4px 15px; }}
-        .hanzi-lyric {{ padding-top: 15px; }}
-        .eng-lyric {{ padding-bottom: 15px; }}
-      }}
-    </style>
+    <link rel="stylesheet" href="{css_url}" />
 </head>
 <body>
     <nav class="nav-bar"><a href="index.html" class="back-btn">Back to Library</a></nav>
@@ -78,8 +101,8 @@ HTML_TEMPLATE = """<!DOCTYPE html>
             <h1>{title_cn}</h1>
             <div class="sub-header">{title_en}</div>
             <div class="tools-bar">
-                <a href="https://www.mdbg.net/chinese/dictionary?page=worddict&wdrst=0&wdq={title_cn}" target="_blank" class="tool-btn">📖 Dictionary</a>
-                <a href="https://translate.google.com/?sl=zh-CN&tl=en&text={title_cn}&op=translate" target="_blank" class="tool-btn">🌏 Translate</a>
+                <a href="https://www.mdbg.net/chinese/dictionary?page=worddict&amp;wdrst=0&amp;wdq={title_cn_url}" target="_blank" class="tool-btn">📖 Dictionary</a>
+                <a href="https://translate.google.com/?sl=zh-CN&amp;tl=en&amp;text={title_cn_url}&amp;op=translate" target="_blank" class="tool-btn">🌏 Translate</a>
             </div>
         </div>
 
@@ -97,139 +120,263 @@ HTML_TEMPLATE = """<!DOCTYPE html>
     </div>
 </body>
 </html>
-"""
+""")
 
-# ==========================================
-# 2. THE CONTENT (DATA)
-# ==========================================
-# Add your 6 songs here. I did the first one completely for you.
-songs_data = [
-    {
-        "filename": "1.挪威的森林 (Norwegian Wood).html",
-        "title_cn": "挪威的森林",
-        "title_en": "Norwegian Wood",
-        
-        # VOCAB SECTION (Optional - leave empty [] if none)
-        "vocab": [
-            {
-                "word": "融化", "pinyin": "róng huà", "meaning": "To Melt",
-                "sent_cn": "她的微笑让我的心融化了。", "sent_en": "Her smile melted my heart."
-            },
-            {
-                "word": "宁静", "pinyin": "níng jìng", "meaning": "Tranquil",
-                "sent_cn": "夜晚的森林非常宁静。", "sent_en": "The forest at night is very tranquil."
-            },
-             {
-                "word": "澄清", "pinyin": "chéng qīng", "meaning": "Clear / Clarify",
-                "sent_cn": "湖水很澄清。", "sent_en": "The lake water is very clear."
-            }
-        ],
-
-        # LYRICS SECTION - Just pasted the Chinese lines. 
-        # Python will handle the HTML table structure.
-        # Format: (Chinese, English Translation)
-        "lyrics_raw": [
-            ("让我将你心儿摘下", "Let me take off your heart"),
-            ("试着将它慢慢溶化", "Try to melt it slowly"),
-            ("看我在你心中是否仍完美无瑕", "See if I am still perfect in your heart"),
-            ("是否依然爲我丝丝牵挂", "Do you still worry about me a little?"),
-            ("依然爱我无法自拔", "Still love me uncontrollably"),
-            ("心中是否有我未曾到过的地方啊", "Is there a place in your heart I haven't been?"),
-            ("那裏湖面总是澄清", "The lake surface there is always clear"),
-            ("那裏空气充满宁静", "The air there is full of tranquility"),
-            ("雪白明月照在大地", "Snow-white moon shines on the earth"),
-            ("藏著你不愿提起的回忆", "Hiding memories you don't want to mention"),
-            ("你要真心总是可以从头", "You say a true heart can always start over"),
-            ("真爱总是可以长久", "True love can always last long"),
-            ("为何你的眼神还有孤独时的落寞", "Why do your eyes still have that loneliness?"),
-            ("是否我只是你一种寄托", "Am I just an emotional support for you?"),
-            ("填满你感情的缺口", "Filling the void in your emotions"),
-            ("心中那片森林何时能让我停留", "When will that forest in your heart let me stay?"),
-            ("那裏湖面总是澄清", "The lake surface there is always clear"),
-            ("那裏空气充满宁静", "The air there is full of tranquility"),
-            ("雪白明月照在大地", "Snow-white moon shines on the earth"),
-            ("藏著你最深处的祕密", "Hiding your deepest secrets"),
-            ("或许我 不该问", "Maybe I shouldn't ask"),
-            ("让你平静的心再起涟漪", "Causing ripples in your calm heart"),
-            ("只是爱你的心超出了界线", "But my love for you crossed the line"),
-            ("我想拥有你所有一切", "I want to own everything about you"),
-            ("应该是 我不该问", "It must be that I shouldn't ask"),
-            ("不该让你再将往事重提", "Shouldn't make you bring up the past again"),
-            ("只是心中枷锁", "It's just the shackles in my heart"),
-            ("该如何才能解脱", "How can I break free?")
-            # Note: I shortened the repetitive parts for the example, 
-            # but you can paste the WHOLE list here.
-        ]
-    }
-    # ADD SONG 2 HERE...
-    # ADD SONG 3 HERE...
-]
-
-# ==========================================
-# 3. THE LOGIC (GENERATOR)
-# ==========================================
-def generate_pinyin(text):
-    if HAS_PYPINYIN:
-        # Generate pinyin, capitalize first letter
-        raw_py = pinyin(text, style=Style.TONE)
-        flat_py = " ".join([x[0] for x in raw_py])
-        return flat_py
-    return "..." # Placeholder if library not installed
-
-def build_files():
-    for song in songs_data:
-        print(f"🔨 Building: {song['title_en']}...")
-        
-        # 1. Build Vocab HTML
-        vocab_html = ""
-        for v in song['vocab']:
-            vocab_html += f"""
+# Repeated fragments, compiled once like the page template
+VOCAB_CARD_TEMPLATE = Template("""
             <div class="vocab-card">
                 <div class="card-header">
-                    <div><span class="header-word">{v['word']}</span><span class="header-pinyin">{v['pinyin']}</span></div>
-                    <span class="header-meaning">{v['meaning']}</span>
+                    <div><span class="header-word">{word}</span><span class="header-pinyin">{pinyin}</span></div>
+                    <span class="header-meaning">{meaning}</span>
                 </div>
                 <div class="card-body">
                     <div class="concept-row">
                         <div class="concept-label">Example</div>
                         <div>
-                            <div>{v['sent_cn']}</div>
-                            <div style="color:var(--accent); font-size:0.9em; font-style:italic;">{generate_pinyin(v['sent_cn'])}</div>
-                            <div style="color:var(--text-sub); font-size:0.9em;">{v['sent_en']}</div>
+                            <div>{sent_cn}</div>
+                            <div style="color:var(--accent); font-size:0.9em; font-style:italic;">{sent_pinyin}</div>
+                            <div style="color:var(--text-sub); font-size:0.9em;">{sent_en}</div>
                         </div>
                     </div>
                 </div>
             </div>
-            """
-
-        # 2. Build Lyrics HTML
-        lyrics_html = ""
-        for line in song['lyrics_raw']:
-            cn_text = line[0]
-            en_text = line[1]
-            py_text = generate_pinyin(cn_text)
-            
-            lyrics_html += f"""
+            """)
+
+LYRIC_ROW_TEMPLATE = Template("""
             <tr>
                 <td class="hanzi-lyric">{cn_text}</td>
                 <td class="pinyin-lyric">{py_text}</td>
                 <td class="eng-lyric">{en_text}</td>
             </tr>
-            """
-
-        # 3. Combine into final HTML
-        full_html = HTML_TEMPLATE.format(
-            title_cn=song['title_cn'],
-            title_en=song['title_en'],
-            vocab_html=vocab_html,
-            lyrics_html=lyrics_html
-        )
-
-        # 4. Save File
-        with open(song['filename'], "w", encoding="utf-8") as f:
-            f.write(full_html)
-            
-    print("✅ All song pages updated successfully!")
+            """)
+
+# ==========================================
+# 2. THE CONTENT (DATA)
+# ==========================================
+# One file per song in song_data/ (JSON, TOML or YAML), or JSONL files with
+# one song per line. Each song looks like:
+#   {
+#     "filename": "1.挪威的森林 (Norwegian Wood).html",
+#     "title_cn": "挪威的森林", "title_en": "Norwegian Wood",
+#     "vocab": [{"word": ..., "pinyin": ..., "meaning": ..., "sent_cn": ..., "sent_en": ...}],
+#     "lyrics_raw": [["Chinese line", "English translation"], ...]
+#   }
+# Songs are read and written one at a time, so memory use does not grow
+# with the size of the catalogue.
+SONG_SOURCES_DIR = os.path.join(os.getcwd(), "song_data")
+SONG_NUMBER_PATTERN = re.compile(r'^(\d+)\.')
+
+def song_id(song):
+    """The song's "id", or else the N. number its filename starts with."""
+    if song.get("id") is not None:
+        return str(song["id"])
+    match = SONG_NUMBER_PATTERN.match(song["filename"])
+    return match.group(1) if match else os.path.splitext(song["filename"])[0]
+
+def check_source_file(path):
+    """Raise ValueError if path is not a song file this install can read."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".toml" and not HAS_TOML:
+        raise ValueError(f"Reading '{path}' needs tomllib (Python 3.11+)")
+    if ext in (".yaml", ".yml") and not HAS_YAML:
+        raise ValueError(f"Reading '{path}' needs PyYAML (pip install pyyaml)")
+    if ext not in (".json", ".jsonl", ".toml", ".yaml", ".yml"):
+        raise ValueError(f"Unsupported song file '{path}' (expected .json, .jsonl, .toml, .yaml or .yml)")
+
+def load_source_file(path):
+    """Yield the song(s) stored in one source file."""
+    check_source_file(path)
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".jsonl":
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif ext == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            yield json.load(f)
+    elif ext == ".toml":
+        with open(path, "rb") as f:
+            yield tomllib.load(f)
+    elif ext in (".yaml", ".yml"):
+        with open(path, "r", encoding="utf-8") as f:
+            yield yaml.safe_load(f)
+
+def iter_songs(source=SONG_SOURCES_DIR):
+    """Stream songs from a source directory (sorted by filename) or a single file."""
+    if os.path.isfile(source):
+        yield from load_source_file(source)
+        return
+
+    extensions = [".json", ".jsonl"]
+    if HAS_TOML:
+        extensions.append(".toml")
+    if HAS_YAML:
+        extensions += [".yaml", ".yml"]
+
+    for name in sorted(os.listdir(source)):
+        if os.path.splitext(name)[1].lower() in extensions:
+            yield from load_source_file(os.path.join(source, name))
+
+# ==========================================
+# 3. THE LOGIC (GENERATOR)
+# ==========================================
+def generate_pinyin(text):
+    # Memoized in pinyin_cache, so repeated choruses are only converted once
+    with stats.stage("pinyin"):
+        return line_pinyin(text)
+
+def highlight_lyric(text, highlighters):
+    """The lyric line as HTML, with vocabulary words wrapped in <span class="...">."""
+    with stats.stage("highlight"):
+        return Markup("".join(
+            escape(segment) if tag is None else f'<span class="{tag}">{escape(segment)}</span>'
+            for segment, tag in mark_line(text, highlighters)))
+
+def render_page(song, css_url, word_list=None):
+    """Render one song dict to the full page HTML, yielding it in chunks.
+
+    The song's vocab words are highlighted in the lyrics (class "highlight"),
+    and so are the words of word_list, a Highlighter shared by all songs
+    (class "hsk"); a longer match wins, the song's own word on a tie.
+    """
+    # 1. Build Vocab HTML
+    vocab_html = (
+        VOCAB_CARD_TEMPLATE.render(
+            word=v['word'], pinyin=v['pinyin'], meaning=v['meaning'],
+            sent_cn=v['sent_cn'], sent_pinyin=generate_pinyin(v['sent_cn']), sent_en=v['sent_en'])
+        for v in song['vocab']
+    )
+
+    # 2. Build Lyrics HTML
+    with stats.stage("pinyin"):
+        lyrics_pinyin = batch_pinyin([line[0] for line in song['lyrics_raw']])
+    highlighters = [(Highlighter(v['word'] for v in song['vocab']), "highlight")]
+    if word_list:
+        highlighters.append((word_list, "hsk"))
+    lyrics_html = (
+        LYRIC_ROW_TEMPLATE.render(cn_text=highlight_lyric(line[0], highlighters),
+                                  py_text=py_text, en_text=line[1])
+        for line, py_text in zip(song['lyrics_raw'], lyrics_pinyin)
+    )
+
+    # 3. Combine into final HTML (fragments are streamed, never concatenated)
+    return HTML_TEMPLATE.iter_render(
+        css_url=css_url,
+        title_cn=song['title_cn'],
+        title_cn_url=urllib.parse.quote(song['title_cn']),
+        title_en=song['title_en'],
+        vocab_html=vocab_html,
+        lyrics_html=lyrics_html
+    )
+
+def select_songs(songs, song_ids=None):
+    """Keep only the songs whose song_id() is in song_ids (all songs if empty)."""
+    for song in songs:
+        if not song_ids or song_id(song) in song_ids:
+            yield song
+
+# Written into the footer of every page from HTML_TEMPLATE. An existing page
+# without it was written by hand (e.g. the pages in songs/) and is never replaced.
+GENERATED_MARK = "Generated by build_pages.py"
+
+def is_generated(path):
+    """True unless path is an existing page that build_pages.py did not write."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return GENERATED_MARK in f.read()
+    except FileNotFoundError:
+        return True
+
+def skip_hand_written(songs, out_dir):
+    for song in songs:
+        path = os.path.join(out_dir, song['filename'])
+        if is_generated(path):
+            yield song
+        else:
+            print(f"⚠️ Skipping '{path}': it exists and was not generated by build_pages.py")
+            stats.count("pages_skipped")
+
+def render_pages(songs, css_url, word_list=None):
+    for song in songs:
+        print(f"🔨 Building: {song['title_en']}...")
+        yield song, render_page(song, css_url, word_list)
+
+def build_files(source=SONG_SOURCES_DIR, song_ids=None, out_dir=".", words=None):
+    """Stream songs from source, handing each page to the writer as soon as it is rendered.
+
+    Pages whose content did not change are left untouched; changed ones get
+    .gz/.br siblings and an entry in the asset manifest. Existing pages that
+    were not generated by this script are skipped, never overwritten. words is an optional
+    word list file (e.g. HSK) highlighted in every song. Returns the paths of
+    the pages actually written.
+    """
+    if not static_assets.in_site(out_dir):
+        # The stylesheet and manifest live under the site root, which a page
+        # outside it could not link to once deployed
+        raise ValueError(f"out_dir must be inside '{static_assets.ROOT_DIR}': {out_dir}")
+    count = 0
+    word_list = None
+    if words:
+        with stats.stage("highlight"):
+            word_list = Highlighter(load_word_list(words))
+        print(f"🖍️  {len(word_list)} words from '{words}' will be highlighted.")
+    songs = stats.timed_iter("load", iter_songs(source))
+    css_path = static_assets.asset_path("page.css", PAGE_CSS)
+    css_url = static_assets.url_from(out_dir, css_path)
+    last = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    os.makedirs(static_assets.ASSETS_DIR, exist_ok=True)
+    with FileWriter(precompress=True) as writer:
+        writer.write(css_path, PAGE_CSS)
+        for song, full_html in render_pages(skip_hand_written(select_songs(songs, song_ids), out_dir),
+                                             css_url, word_list):
+            # 4. Save File (the page is compared and written in the background)
+            path = os.path.join(out_dir, song['filename'])
+            text = "".join(stats.timed_iter("render", full_html))
+            with stats.stage("write"):
+                writer.write(path, text)
+            count += 1
+
+            now = time.perf_counter()
+            stats.file_time(path, now - last)
+            last = now
+
+        with stats.stage("write"):
+            writer.close()
+            static_assets.prune_assets([css_path])
+            static_assets.update_manifest(writer.published)
+            save_cache()
+    for name, value in cache_counters().items():
+        stats.count(name, value)
+
+    if song_ids and count == 0:
+        print(f"⚠️ No song with id {', '.join(song_ids)} in '{source}'.")
+    pages = [path for path in writer.written if path != css_path]
+    print(f"✅ {len(pages)} song page(s) updated, {count - len(pages)} unchanged.")
+    return pages
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate song pages from the song sources.")
+    parser.add_argument("ids", nargs="*",
+                        help="only build these songs (the \"id\" field or the N. number of the filename)")
+    parser.add_argument("--source", default=SONG_SOURCES_DIR,
+                        help="directory of song files, or a single .json/.jsonl/.toml/.yaml file")
+    parser.add_argument("--out-dir", default=".",
+                        help="where to write the pages, inside the current directory (default: the current directory)")
+    parser.add_argument("--words", metavar="PATH",
+                        help="also highlight the words of this list (e.g. HSK), one per line")
+    build_stats.add_arguments(parser)
+    args = parser.parse_args()
+    if not static_assets.in_site(args.out_dir):
+        parser.error(f"--out-dir must be inside the site root ('{static_assets.ROOT_DIR}')")
+    if os.path.isfile(args.source):
+        try:
+            check_source_file(args.source)
+        except ValueError as e:
+            parser.error(str(e))
+    with build_stats.instrumented("build_pages", args):
+        build_files(args.source, args.ids, args.out_dir, args.words)
 
 if __name__ == "__main__":
-    build_files()
+    main()
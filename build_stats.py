@@ -0,0 +1,112 @@
+"""Timing and counters for the build scripts.
+
+Both scripts record into the module-level `stats` object:
+
+    with stats.stage("parse"):
+        ...
+    stats.count("cache_hits")
+    stats.file_time(path, seconds)
+
+Stages nest and are reported exclusively, so time spent in an inner stage
+(e.g. "pinyin" while rendering a page) is not counted again in the outer
+one. Streaming pipelines can be timed with stats.timed_iter(), which charges
+each step of an iterator to a stage.
+"""
+import cProfile
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+class BuildStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self, script=None):
+        self.script = script
+        self.started = datetime.now(timezone.utc)
+        self.start_time = time.perf_counter()
+        self.stages = {}      # stage name -> exclusive seconds
+        self.counters = {}
+        self.files = {}       # path -> seconds spent on that file
+        self._stack = []      # [stage name, seconds spent in nested stages]
+
+    @contextmanager
+    def stage(self, name):
+        self._stack.append([name, 0.0])
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            _, nested = self._stack.pop()
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed - nested
+            if self._stack:
+                self._stack[-1][1] += elapsed
+
+    def timed_iter(self, name, iterable):
+        """Yield from iterable, charging the time spent producing each item to a stage."""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def file_time(self, path, seconds):
+        self.files[path] = self.files.get(path, 0.0) + seconds
+
+    def report(self):
+        return {
+            "script": self.script,
+            "started": self.started.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "total_seconds": round(time.perf_counter() - self.start_time, 6),
+            "stages": {name: round(t, 6) for name, t in self.stages.items()},
+            "counters": dict(self.counters),
+            "slowest_files": sorted(self.files, key=self.files.get, reverse=True)[:10],
+            "files": {path: round(t, 6) for path, t in self.files.items()},
+        }
+
+    def write_report(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=1)
+
+    def summary(self):
+        """One-line stage breakdown for the console."""
+        total = time.perf_counter() - self.start_time
+        stages = " · ".join(f"{name} {t:.2f}s" for name, t in self.stages.items())
+        return f"⏱️  {total:.2f}s total ({stages})"
+
+stats = BuildStats()
+
+def add_arguments(parser):
+    parser.add_argument("--report", metavar="PATH",
+                        help="write stage timings and counters as JSON to PATH")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="write a cProfile dump of the main process to PATH (view with pstats/snakeviz)")
+
+@contextmanager
+def instrumented(script, args):
+    """Reset stats for a run, optionally under cProfile, and report when done."""
+    stats.reset(script)
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    try:
+        yield stats
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        print(stats.summary())
+        if args.report:
+            stats.write_report(args.report)
@@ -0,0 +1,87 @@
+"""Catalogue-wide vocabulary concordance: which vocab words occur in which songs.
+
+Every word that is a .vocab-card word on some song page is looked up in the
+Hanzi lyric lines of every song, not just its own, with one Aho-Corasick
+pass per line (see highlighter.py; overlapping words are all counted, so
+森林 is found inside 挪威的森林 even when that is a vocab word too).
+
+Words get integer ids in order of frequency, and the output mirrors the
+search index layout:
+
+    vocab/words.json   {"shards": N, "words": [[word, pinyin, occurrences,
+                         songs it occurs in, songs it is a vocab word of], ...]}
+    vocab/<n>.json     {word id: [-1 - song, line, line, ..., -1 - song, line, ...], ...}
+                       for the ids with id % N == n
+
+Songs are catalogue.json indexes and lines index the song's lyric rows and
+vocab cards, exactly as in search/, so a concordance hit can be shown with
+the same code as a lyrics search hit. Postings are flat integer lists: each
+song id (stored as -1 - id, so it cannot be mistaken for a line) followed by
+the lines it occurs on.
+"""
+import json
+
+from highlighter import Highlighter
+from pinyin_cache import HAS_PYPINYIN, syllables
+from search_index import shard_count
+
+CONCORDANCE_DIR = "vocab"
+
+def build_concordance(songs):
+    """Build the concordance for songs given as dicts with "vocab" and "lyrics",
+    in catalogue order.
+
+    Only the word list and the integer postings are kept while the songs are
+    scanned one by one, so memory grows with the number of matches, not with
+    the size of the pages. Returns {relative path: JSON text}.
+    """
+    # 1. Word ids (provisional, in order of first appearance) and who teaches them
+    ids = {}
+    taught_by = []
+    for song_id, song in enumerate(songs):
+        for word in song.get("vocab", []):
+            if word not in ids:
+                ids[word] = len(ids)
+                taught_by.append(set())
+            taught_by[ids[word]].add(song_id)
+    words = list(ids)
+    automaton = Highlighter(words)
+
+    # 2. One pass over every lyric line of every song
+    postings = [[] for _ in words]
+    counts = [0] * len(words)
+    last_hit = [None] * len(words)   # (song, line) of each word's latest posting
+    for song_id, song in enumerate(songs):
+        for line_no, text in song.get("lyrics", []):
+            for start, end in automaton.occurrences(text):
+                word_id = ids[text[start:end]]
+                counts[word_id] += 1
+                previous = last_hit[word_id]
+                if previous == (song_id, line_no):
+                    continue
+                if previous is None or previous[0] != song_id:
+                    postings[word_id].append(-1 - song_id)
+                postings[word_id].append(line_no)
+                last_hit[word_id] = (song_id, line_no)
+
+    # 3. Final ids: most frequent first (ties keep first appearance)
+    order = sorted(range(len(words)), key=lambda i: -counts[i])
+    table = []
+    for old_id in order:
+        word = words[old_id]
+        pinyin = " ".join(syllables(word)) if HAS_PYPINYIN else ""
+        songs_with_word = sum(1 for entry in postings[old_id] if entry < 0)
+        table.append([word, pinyin, counts[old_id], songs_with_word, sorted(taught_by[old_id])])
+
+    num_shards = shard_count(sum(4 * len(entries) for entries in postings))
+
+    shards = [{} for _ in range(num_shards)]
+    for new_id, old_id in enumerate(order):
+        if postings[old_id]:
+            shards[new_id % num_shards][new_id] = postings[old_id]
+
+    files = {f"{CONCORDANCE_DIR}/words.json": json.dumps(
+        {"shards": num_shards, "words": table}, ensure_ascii=False, separators=(",", ":"))}
+    for n, shard in enumerate(shards):
+        files[f"{CONCORDANCE_DIR}/{n}.json"] = json.dumps(shard, separators=(",", ":"))
+    return files
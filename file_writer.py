@@ -0,0 +1,158 @@
+"""Output files for the build scripts: atomic, skipped when unchanged, written in the background.
+
+    with FileWriter() as writer:
+        writer.write("index.html", text)
+    writer.written   # paths whose content actually changed
+
+A file is only replaced when its bytes differ from what is already on disk
+(the size is checked first, so most changed files are never read back), so
+unchanged outputs keep their mtime and git sees no churn. Changed files are
+written to a temporary file next to the target and renamed over it, so a
+reader (or a crashed build) never sees a half-written page. The reads,
+compares and writes run in a thread pool while the caller renders the next
+file; at most `max_pending` files are held in memory at a time.
+
+With precompress=True, HTML/CSS/JS/JSON files also get .gz (and, if the
+brotli package is installed, .br) siblings for static servers that serve
+precompressed files. Siblings are only recompressed when their file changed
+(or they are missing), and writer.published records the content hash and
+available encodings of every such file for the asset manifest.
+"""
+import gzip
+import hashlib
+import os
+import threading
+from collections import deque
+
+from build_stats import stats
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+WRITE_WORKERS = 8
+MAX_PENDING = 64
+
+PRECOMPRESS_EXTENSIONS = (".html", ".css", ".js", ".json")
+
+# Quality 11 is ~15x slower than 5 for ~10% smaller pages, and every changed
+# page of a cold build has to be compressed
+BROTLI_QUALITY = 5
+
+# (Content-Encoding, file suffix, compress function); mtime=0 keeps .gz output reproducible
+COMPRESSORS = [("gzip", ".gz", lambda data: gzip.compress(data, 9, mtime=0))]
+if HAS_BROTLI:
+    COMPRESSORS.insert(0, ("br", ".br", lambda data: brotli.compress(data, quality=BROTLI_QUALITY)))
+# Every suffix a sibling may have, also ones left over from runs with brotli installed
+COMPRESSED_SUFFIXES = (".br", ".gz")
+
+def original_name(name):
+    """'index.html.gz' -> 'index.html' (names without a compressed suffix are returned as is)."""
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+def write_if_changed(path, data):
+    """Atomically replace path with data (bytes) unless it already holds exactly that.
+
+    Returns True if the file was written.
+    """
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
+
+def write_compressed(path, data, changed):
+    """Bring the precompressed siblings of path up to date. Returns the encodings available.
+
+    A sibling that would not be smaller than the file itself is not kept.
+    """
+    encodings = []
+    for encoding, suffix, compress in COMPRESSORS:
+        sibling = path + suffix
+        if not changed and os.path.exists(sibling):
+            encodings.append(encoding)
+            continue
+        packed = compress(data)
+        if len(packed) < len(data):
+            write_if_changed(sibling, packed)
+            encodings.append(encoding)
+        elif os.path.exists(sibling):
+            os.remove(sibling)
+    return encodings
+
+def publish_file(path, data, precompress):
+    """Write one output file; returns (changed, manifest entry or None)."""
+    changed = write_if_changed(path, data)
+    if not (precompress and path.endswith(PRECOMPRESS_EXTENSIONS)):
+        return changed, None
+    return changed, {
+        "hash": hashlib.sha256(data).hexdigest()[:16],
+        "encodings": write_compressed(path, data, changed),
+    }
+
+class FileWriter:
+    def __init__(self, workers=WRITE_WORKERS, max_pending=MAX_PENDING, precompress=False):
+        # Imported here so runs that write nothing (e.g. a no-op build) never load it
+        from concurrent.futures import ThreadPoolExecutor
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._pending = deque()   # (path, size, future) in submission order
+        self._max_pending = max_pending
+        self._precompress = precompress
+        self.written = []
+        self.published = {}       # path -> {"hash", "encodings"} of precompressed files
+
+    def write(self, path, text):
+        """Queue text (str or bytes) to be written to path if it changed."""
+        data = text.encode("utf-8") if isinstance(text, str) else text
+        future = self._pool.submit(publish_file, path, data, self._precompress)
+        self._pending.append((path, len(data), future))
+        while len(self._pending) > self._max_pending:
+            self._collect()
+
+    def _collect(self):
+        # Counters are only touched here, on the caller's thread
+        path, size, future = self._pending.popleft()
+        changed, entry = future.result()
+        if entry is not None:
+            self.published[path] = entry
+        if changed:
+            self.written.append(path)
+            stats.count("files_written")
+            stats.count("bytes_written", size)
+        else:
+            stats.count("files_unchanged")
+
+    def close(self):
+        """Wait for every queued file; returns the paths that were written."""
+        try:
+            while self._pending:
+                self._collect()
+        finally:
+            self._pool.shutdown()
+        return self.written
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._pool.shutdown(cancel_futures=True)
@@ -0,0 +1,120 @@
+"""Vocabulary highlighting for lyric lines (Aho-Corasick, leftmost-longest).
+
+A word list is compiled once into an automaton: a trie whose nodes also have
+failure links (the longest proper suffix that is still in the trie), so a line
+is scanned in a single pass no matter how many words there are. Every match
+is recorded at its start position, keeping the longest word starting there,
+and a final sweep picks leftmost matches, longest first, without overlaps:
+with 朦胧 and 朦胧的 in the list, "朦胧的" is one highlight, not two.
+
+Several automatons (e.g. the song's own vocabulary and a global HSK list)
+can mark the same line together; on equally long matches the earlier one wins.
+
+    song_words = Highlighter(["融化", "宁静"])
+    mark_line("宁静的湖面", [(song_words, "highlight")])
+    # -> [("宁静", "highlight"), ("的湖面", None)]
+"""
+
+class Highlighter:
+    def __init__(self, words):
+        # State 0 is the root. goto[s] maps a character to the next state,
+        # fail[s] is the failure link, length[s] the length of the word ending
+        # at s (0 if none) and dict_link[s] the next state on the failure chain
+        # that ends a word, so all matches at a position are found in O(matches).
+        self.goto = [{}]
+        self.fail = [0]
+        self.length = [0]
+        self.dict_link = [0]
+        for word in words:
+            if word:
+                self._add(word)
+        self._link()
+
+    def __len__(self):
+        return sum(1 for n in self.length if n)
+
+    def _add(self, word):
+        state = 0
+        for ch in word:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.length.append(0)
+                self.dict_link.append(0)
+            state = nxt
+        self.length[state] = len(word)
+
+    def _link(self):
+        # Breadth-first, so a state's failure target is always linked before it
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                fail = self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.dict_link[nxt] = fail if self.length[fail] else self.dict_link[fail]
+
+    def occurrences(self, text):
+        """Yield (start, end) of every word occurring in text, overlaps included."""
+        goto, fail, length, dict_link = self.goto, self.fail, self.length, self.dict_link
+        state = 0
+        for end, ch in enumerate(text, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            out = state if length[state] else dict_link[state]
+            while out:
+                yield end - length[out], end
+                out = dict_link[out]
+
+    def longest_at(self, text, best, tag):
+        """Record, per start index, the longest word found in text.
+
+        best[i] is a (length, tag) pair (or None) and is only replaced by a
+        strictly longer match, so earlier calls win ties.
+        """
+        for start, end in self.occurrences(text):
+            n = end - start
+            if best[start] is None or best[start][0] < n:
+                best[start] = (n, tag)
+
+def mark_line(text, highlighters):
+    """Split text into (segment, tag) pairs; tag is None outside matches.
+
+    highlighters is a list of (Highlighter, tag) in order of priority.
+    """
+    best = [None] * len(text)
+    for highlighter, tag in highlighters:
+        highlighter.longest_at(text, best, tag)
+
+    segments = []
+    plain_start = i = 0
+    while i < len(text):
+        if best[i] is None:
+            i += 1
+            continue
+        n, tag = best[i]
+        if plain_start < i:
+            segments.append((text[plain_start:i], None))
+        segments.append((text[i:i + n], tag))
+        i += n
+        plain_start = i
+    if plain_start < len(text):
+        segments.append((text[plain_start:], None))
+    return segments
+
+def load_word_list(path):
+    """Words from a text file, one per line; anything after a tab or space is ignored
+    (so HSK lists with pinyin/meaning columns work). Lines starting with # are skipped."""
+    words = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            word = line.split("\t", 1)[0].split(" ", 1)[0].strip()
+            if word and not word.startswith("#"):
+                words.append(word)
+    return words
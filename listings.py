@@ -0,0 +1,155 @@
+"""Static listing pages for browsing the catalogue without index.html's script.
+
+index.html only carries the first page of cards and renders the rest from
+catalogue.json; these pages split the same cards into small, linkable pages
+instead, all built in one pass over the songs:
+
+    browse/index.html              every facet value, with song counts
+    browse/page-<n>.html           the whole catalogue, per_page cards a page
+    browse/genre-<slug>.html       songs with that .tag-pill genre
+    browse/artist-<slug>.html      songs by that artist
+    browse/initial-<x>.html        titles whose pinyin starts with that letter
+                                   (a-z, or initial-other.html for the rest)
+
+A facet value with more songs than fit on a page continues on
+genre-<slug>.2.html, .3.html and so on, linked with prev/next (also as
+<link rel> in the head). Slugs are the value lowercased without tone marks,
+with everything but letters and digits turned into dashes, so URLs stay the
+same from build to build; if two values share a slug, the one that sorts
+first keeps it and the others get -2, -3...
+
+Pages set <base href="../">, so the cards and the stylesheet URL are exactly
+the ones rendered for index.html.
+"""
+import re
+import urllib.parse
+
+from search_index import strip_tones
+from templates import Markup, Template, escape
+
+LISTING_DIR = "browse"
+
+# File prefix -> (heading on the browse page, title of a value's page)
+FACETS = {
+    "initial": ("A–Z", "Titles starting with {}"),
+    "genre": ("Genres", "{}"),
+    "artist": ("Artists", "Songs by {}"),
+}
+
+LISTING_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <base href="../">
+    <title>{title} - Chinese Song Library</title>
+    <link rel="stylesheet" href="{css_url}">{rel_links}
+</head>
+<body>
+<div class="container">
+    <header>
+        <h1>{heading}</h1>
+        <p class="subtitle">{subtitle}</p>
+        <nav class="crumbs"><a href="index.html">🎵 Library</a> · <a href="{browse_url}">🗂️ Browse</a></nav>
+    </header>
+    {body}
+    {pager}
+    <div class="footer"><p>Auto-generated by build_index.py</p></div>
+</div>
+</body>
+</html>
+""")
+
+PAGER_TEMPLATE = Template("""<nav class="pager">{prev} <span>Page {page} of {pages}</span> {next}</nav>""")
+
+def slugify(value):
+    return re.sub(r"\W+", "-", strip_tones(value).casefold()).strip("-") or "other"
+
+def sort_key(value):
+    return strip_tones(value).casefold(), value
+
+def pinyin_initial(song):
+    """First letter of the title's pinyin (or of a Latin title), A-Z, else '#'."""
+    text = strip_tones(song["pinyin"] or song["title"]).strip()
+    initial = text[:1].upper()
+    return initial if "A" <= initial <= "Z" else "#"
+
+def site_url(path):
+    """Link to a site path from a listing page (relative to <base>)."""
+    return urllib.parse.quote(path)
+
+def page_paths(stem, pages):
+    return [f"{LISTING_DIR}/{stem}.html"] + [f"{LISTING_DIR}/{stem}.{n}.html" for n in range(2, pages + 1)]
+
+def render_listing(paths, song_ids, cards, per_page, css_url, title, heading, subtitle):
+    """Split song_ids over the given page paths. Returns {path: html}."""
+    files = {}
+    for n, path in enumerate(paths):
+        prev_url = site_url(paths[n - 1]) if n else None
+        next_url = site_url(paths[n + 1]) if n + 1 < len(paths) else None
+        rel_links = "".join(f'\n    <link rel="{rel}" href="{url}">'
+                            for rel, url in (("prev", prev_url), ("next", next_url)) if url)
+        pager = ""
+        if len(paths) > 1:
+            pager = PAGER_TEMPLATE.render(
+                prev=Markup(f'<a href="{prev_url}" rel="prev">‹ Prev</a>') if prev_url else "",
+                next=Markup(f'<a href="{next_url}" rel="next">Next ›</a>') if next_url else "",
+                page=n + 1, pages=len(paths))
+        grid = [Markup('<div class="song-grid">')]
+        grid += [cards[i] for i in song_ids[n * per_page:(n + 1) * per_page]]
+        grid.append(Markup("\n    </div>"))
+        files[path] = LISTING_TEMPLATE.render(
+            title=title if n == 0 else f"{title} (page {n + 1})",
+            css_url=css_url, rel_links=Markup(rel_links), heading=heading, subtitle=subtitle,
+            browse_url=site_url(f"{LISTING_DIR}/index.html"), body=grid, pager=pager)
+    return files
+
+def build_listings(songs, cards, per_page, css_url):
+    """Render every listing page for songs in catalogue order.
+
+    cards[i] is the rendered card of songs[i] (the same Markup index.html
+    uses) and css_url the stylesheet URL relative to the site root.
+    Returns {relative path: HTML}.
+    """
+    # 1. One pass: the song ids of every facet value, in catalogue order
+    groups = {facet: {} for facet in FACETS}
+    for song_id, song in enumerate(songs):
+        groups["initial"].setdefault(pinyin_initial(song), []).append(song_id)
+        groups["genre"].setdefault(song["genre"], []).append(song_id)
+        groups["artist"].setdefault(song["artist"] or "Unknown artist", []).append(song_id)
+
+    files = {}
+    pages = max(1, -(-len(songs) // per_page))
+    numbered = [f"{LISTING_DIR}/page-{n}.html" for n in range(1, pages + 1)]
+    files.update(render_listing(numbered, range(len(songs)), cards, per_page, css_url,
+                                "All songs", "🎵 All songs", f"{len(songs)} songs"))
+
+    # 2. One listing per facet value, and the browse page linking them all
+    sections = []
+    for facet, (section_title, page_title) in FACETS.items():
+        links = []
+        used = set()
+        for value in sorted(groups[facet], key=sort_key):
+            slug = base = slugify(value)
+            n = 1
+            while slug in used:
+                n += 1
+                slug = f"{base}-{n}"
+            used.add(slug)
+
+            song_ids = groups[facet][value]
+            paths = page_paths(f"{facet}-{slug}", -(-len(song_ids) // per_page))
+            files.update(render_listing(paths, song_ids, cards, per_page, css_url,
+                                        page_title.format(value), page_title.format(value),
+                                        f"{len(song_ids)} song{'s' if len(song_ids) != 1 else ''}"))
+            links.append(f'<a href="{site_url(paths[0])}">{escape(value)} <span>{len(song_ids)}</span></a>')
+        sections.append(f'<h2>{section_title}</h2>\n    <div class="facet-list">{"".join(links)}</div>')
+
+    page_links = "".join(f'<a href="{site_url(path)}">{n}</a>' for n, path in enumerate(numbered, 1))
+    sections.append(f'<h2>Pages</h2>\n    <div class="facet-list">{page_links}</div>')
+    files[f"{LISTING_DIR}/index.html"] = LISTING_TEMPLATE.render(
+        title="Browse", css_url=css_url, rel_links="", heading="🗂️ Browse",
+        subtitle=f"{len(songs)} songs by title, genre and artist",
+        browse_url=site_url(f"{LISTING_DIR}/index.html"),
+        body=Markup("\n    ".join(sections)), pager="")
+    return files
@@ -0,0 +1,176 @@
+import argparse
+import http.client
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+
+import static_assets
+
+# --- CONFIGURATION ---
+DEFAULT_CONNECTIONS = 8
+DEFAULT_DURATION = 10.0
+
+# Rough shape of real traffic: mostly the library page and its data, then song pages
+WEIGHTS = {"index.html": 5, "catalogue.json": 3, "assets": 3, "search": 2, "browse": 2, "songs": 4}
+
+def site_urls():
+    """URL paths to request, grouped by kind, from the manifest and songs/."""
+    manifest = static_assets.load_manifest().get("files", {})
+    groups = {kind: [] for kind in WEIGHTS}
+    for path in manifest:
+        if path in ("index.html", "catalogue.json"):
+            groups[path].append(path)
+        elif path.startswith("assets/"):
+            groups["assets"].append(path)
+        elif path.startswith("search/"):
+            groups["search"].append(path)
+        elif path.startswith("browse/"):
+            groups["browse"].append(path)
+    songs_dir = os.path.join(static_assets.ROOT_DIR, "songs")
+    if os.path.isdir(songs_dir):
+        groups["songs"] = [f"songs/{name}" for name in sorted(os.listdir(songs_dir)) if name.endswith(".html")]
+    for name in ("index.html", "catalogue.json"):
+        if not groups[name] and os.path.exists(os.path.join(static_assets.ROOT_DIR, name)):
+            groups[name].append(name)
+    return {kind: ["/" + urllib.parse.quote(p) for p in paths] for kind, paths in groups.items() if paths}
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+class Worker(threading.Thread):
+    """One keep-alive connection sending requests back to back until the deadline."""
+
+    def __init__(self, host, port, urls, deadline, encoding, revalidate, seed):
+        super().__init__(daemon=True)
+        self.host, self.port = host, port
+        self.urls = urls
+        self.deadline = deadline
+        self.encoding = encoding
+        self.revalidate = revalidate
+        self.rng = random.Random(seed)
+        self.etags = {}
+        self.latencies = []
+        self.statuses = {}
+        self.bytes = 0
+        self.connections = 0
+        self.errors = 0
+
+    def connect(self):
+        self.connections += 1
+        return http.client.HTTPConnection(self.host, self.port, timeout=10)
+
+    def run(self):
+        conn = self.connect()
+        kinds = list(self.urls)
+        weights = [WEIGHTS[kind] for kind in kinds]
+        while time.perf_counter() < self.deadline:
+            url = self.rng.choice(self.urls[self.rng.choices(kinds, weights)[0]])
+            headers = {"Accept-Encoding": self.encoding}
+            if self.revalidate and url in self.etags:
+                headers["If-None-Match"] = self.etags[url]
+            start = time.perf_counter()
+            try:
+                conn.request("GET", url, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                # Count it and reconnect; a reset connection is also a result
+                self.errors += 1
+                conn.close()
+                conn = self.connect()
+                continue
+            self.latencies.append(time.perf_counter() - start)
+            self.statuses[response.status] = self.statuses.get(response.status, 0) + 1
+            self.bytes += len(body)
+            if response.getheader("ETag"):
+                self.etags[url] = response.getheader("ETag")
+            if response.getheader("Connection", "").lower() == "close":
+                conn.close()
+                conn = self.connect()
+        conn.close()
+
+def run_load_test(base_url, connections, duration, encoding, revalidate):
+    parsed = urllib.parse.urlsplit(base_url)
+    urls = site_urls()
+    if not urls:
+        raise SystemExit("❌ Nothing to request. Run build_index.py first.")
+    deadline = time.perf_counter() + duration
+    workers = [Worker(parsed.hostname, parsed.port or 80, urls, deadline, encoding, revalidate, seed)
+               for seed in range(connections)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(t for w in workers for t in w.latencies)
+    statuses = {}
+    for worker in workers:
+        for status, n in worker.statuses.items():
+            statuses[str(status)] = statuses.get(str(status), 0) + n
+    return {
+        "url": base_url,
+        "connections": connections,
+        "duration": round(elapsed, 3),
+        "accept_encoding": encoding,
+        "revalidate": revalidate,
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "megabytes": round(sum(w.bytes for w in workers) / 2**20, 2),
+        "tcp_connections": sum(w.connections for w in workers),
+        "errors": sum(w.errors for w in workers),
+        "statuses": statuses,
+        "latency_ms": {name: round(percentile(latencies, p) * 1000, 2)
+                       for name, p in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))},
+    }
+
+def print_result(result):
+    lat = result["latency_ms"]
+    print(f"📊 {result['requests']} requests in {result['duration']}s over {result['tcp_connections']} "
+          f"connection(s): {result['requests_per_second']} req/s, {result['megabytes']} MB")
+    print(f"   latency p50 {lat['p50']} ms · p90 {lat['p90']} ms · p99 {lat['p99']} ms · max {lat['max']} ms")
+    statuses = ", ".join(f"{status}×{n}" for status, n in sorted(result["statuses"].items()))
+    print(f"   status {statuses}" + (f" · ⚠️ {result['errors']} error(s)" if result["errors"] else ""))
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the generated site with keep-alive connections.")
+    parser.add_argument("--url", help="server to test (default: start serve.py in-process on a free port)")
+    parser.add_argument("-c", "--connections", type=int, default=DEFAULT_CONNECTIONS,
+                        help="concurrent keep-alive connections (default: %(default)s)")
+    parser.add_argument("-d", "--duration", type=float, default=DEFAULT_DURATION,
+                        help="seconds to run (default: %(default)s)")
+    parser.add_argument("--encoding", default="br, gzip",
+                        help="Accept-Encoding to send, e.g. 'gzip' or 'identity' (default: %(default)s)")
+    parser.add_argument("--revalidate", action="store_true",
+                        help="send If-None-Match for URLs seen before, like a browser with a warm cache")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON to PATH")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        import serve
+        server = serve.make_server(port=0, quiet=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+
+    print(f"🚀 {args.connections} connection(s) for {args.duration}s against {base_url}...")
+    try:
+        result = run_load_test(base_url, args.connections, args.duration, args.encoding, args.revalidate)
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+    print_result(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Shared, memoized pinyin conversion for build_index.py and build_pages.py.
+
+Song lyrics repeat the same chorus lines and words over and over, so nothing
+is converted twice: whole lines are memoized in memory, and every run of
+Hanzi (pypinyin never matches phrases across non-Hanzi characters, so a run
+converts the same on its own as inside a longer line) is memoized both in
+memory and on disk between builds.
+"""
+import importlib.util
+import json
+import os
+import re
+from functools import lru_cache
+
+from file_writer import write_if_changed
+
+# pypinyin takes ~0.25s to import (its phrase dictionary), so it is only
+# imported on the first phrase missing from the cache; lines are split into
+# runs with HANZI_RUN below (the same ranges as pypinyin's simple_seg), so
+# builds served from cache never pay for it.
+HAS_PYPINYIN = importlib.util.find_spec("pypinyin") is not None
+
+# Copied from pypinyin.constants.RE_HANS
+HANZI_RUN = re.compile(
+    "([\u3007\ue815-\ue864\ufa18\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+    "\U00020000-\U0002A6DF\U0002A703-\U0002B73F\U0002B740-\U0002B81D"
+    "\U0002B825-\U0002BF6E\U0002C029-\U0002CE93\U0002D016\U0002D11B-\U0002EBD9"
+    "\U0002F80A-\U0002FA1F\U00030000-\U0003134A\U000300F7-\U00031288"
+    "\U00030EDD\U00030EDE\U00031350-\U00032389]+)")
+
+CACHE_DIR = os.path.join(os.getcwd(), ".build_cache")
+CACHE_FILE = os.path.join(CACHE_DIR, "pinyin.json")
+
+_phrases = {}     # Hanzi run -> list of syllables (persisted to CACHE_FILE)
+_loaded = False
+_version = None
+_dirty = False
+_converted = 0    # phrases actually sent to pypinyin this run
+_pinyin = None    # pypinyin.pinyin and Style.TONE, once imported
+
+def _load_cache():
+    global _loaded, _version
+    # Read from the package metadata, which does not import pypinyin
+    # (importlib.metadata itself is slow to import, so only on first use too)
+    import importlib.metadata
+    _version = importlib.metadata.version("pypinyin")
+    _loaded = True
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return
+    # Different pypinyin versions may disagree, so start fresh after an upgrade
+    if data.get("pypinyin") == _version:
+        _phrases.update(data.get("phrases", {}))
+
+def save_cache():
+    """Write newly converted phrases to disk (no-op if nothing changed)."""
+    global _dirty
+    if not _dirty:
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    text = json.dumps({"pypinyin": _version, "phrases": _phrases}, ensure_ascii=False)
+    write_if_changed(CACHE_FILE, text.encode("utf-8"))
+    _dirty = False
+
+def _convert(run):
+    global _pinyin
+    if _pinyin is None:
+        from pypinyin import pinyin, Style
+        _pinyin = (pinyin, Style.TONE)
+    pinyin, tone = _pinyin
+    return [x[0] for x in pinyin(run, style=tone)]
+
+@lru_cache(maxsize=8192)
+def syllables(text):
+    """Tone-marked syllables for text, e.g. '你好' -> ('nǐ', 'hǎo')."""
+    global _dirty, _converted
+    if not _loaded:
+        _load_cache()
+
+    result = []
+    for run in HANZI_RUN.split(text):
+        if not run:
+            continue
+        converted = _phrases.get(run)
+        if converted is None:
+            converted = _convert(run)
+            _phrases[run] = converted
+            _dirty = True
+            _converted += 1
+        result.extend(converted)
+    return tuple(result)
+
+def line_pinyin(text):
+    """Pinyin for a lyric line or example sentence."""
+    if not HAS_PYPINYIN:
+        return "..." # Placeholder if library not installed
+    return " ".join(syllables(text))
+
+def title_pinyin(text):
+    """Pinyin for a song title, each syllable capitalized."""
+    if not HAS_PYPINYIN:
+        return ""
+    return " ".join(x.capitalize() for x in syllables(text))
+
+def batch_pinyin(lines):
+    """line_pinyin() for a whole song at once; each distinct line is converted once."""
+    unique = {line: line_pinyin(line) for line in dict.fromkeys(lines)}
+    return [unique[line] for line in lines]
+
+def cache_counters():
+    """Hit/miss counts for build reports."""
+    info = syllables.cache_info()
+    return {
+        "pinyin_line_hits": info.hits,
+        "pinyin_line_misses": info.misses,
+        "pinyin_phrases_converted": _converted,
+    }
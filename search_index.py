@@ -0,0 +1,89 @@
+"""Full-text search index over song lyrics and vocabulary.
+
+build_index.py hands over the text of every lyric row / vocab card per song
+and gets back a set of small JSON files: an inverted index from token to the
+(song, line) pairs containing it, split into shards by a hash of the token.
+The library page hashes the query tokens the same way and fetches only the
+shards it needs, so searching lyrics never downloads the song pages.
+
+Tokens are Hanzi unigrams and bigrams (Chinese has no spaces, so overlapping
+bigrams stand in for words), toneless pinyin syllables of the Hanzi, and
+lowercased Latin words (the pinyin and English lines as written).
+"""
+import json
+import re
+import unicodedata
+
+from pinyin_cache import HAS_PYPINYIN, syllables
+
+SEARCH_DIR = "search"
+
+# Shard count grows in powers of two so each shard stays around this size
+TARGET_SHARD_BYTES = 32 * 1024
+
+HANZI_RUN = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+')
+WORD = re.compile(r'[a-z0-9]+')
+
+def strip_tones(text):
+    """'Nuó Wēi' -> 'Nuo Wei' (same as normalize() in the page's search script)."""
+    return "".join(c for c in unicodedata.normalize("NFD", text)
+                   if not unicodedata.combining(c))
+
+def tokenize(text):
+    """Set of index tokens for one line of text."""
+    tokens = set()
+    for run in HANZI_RUN.findall(text):
+        tokens.update(run)
+        tokens.update(run[i:i + 2] for i in range(len(run) - 1))
+        if HAS_PYPINYIN:
+            tokens.update(WORD.findall(strip_tones(" ".join(syllables(run)).lower())))
+    tokens.update(WORD.findall(strip_tones(text.lower())))
+    return tokens
+
+def shard_of(token, num_shards):
+    """32-bit FNV-1a over code points; mirrored by shardOf() in the page script."""
+    h = 0x811c9dc5
+    for ch in token:
+        h ^= ord(ch)
+        h = (h * 16777619) & 0xFFFFFFFF
+    return h % num_shards
+
+def shard_count(total_bytes):
+    """Number of shards (a power of two) for this much posting data."""
+    num_shards = 1
+    while total_bytes / num_shards > TARGET_SHARD_BYTES:
+        num_shards *= 2
+    return num_shards
+
+def build_search_files(song_lines):
+    """Build the index for songs given as lists of lines, in catalogue order.
+
+    Returns {relative path: JSON text}: search/meta.json plus one
+    search/<n>.json per shard. Postings are [song, line, line, ...] lists,
+    where song is the index into catalogue.json and line counts the rows
+    and vocab cards of that song page.
+    """
+    postings = {}
+    for song_id, lines in enumerate(song_lines):
+        for line_no, line in enumerate(lines):
+            for token in tokenize(line):
+                entries = postings.setdefault(token, [])
+                if entries and entries[-1][0] == song_id:
+                    entries[-1].append(line_no)
+                else:
+                    entries.append([song_id, line_no])
+
+    # Rough size estimate: token + a few bytes per number
+    total = sum(len(token) + 4 * sum(len(e) for e in entries)
+                for token, entries in postings.items())
+    num_shards = shard_count(total)
+
+    shards = [{} for _ in range(num_shards)]
+    for token in sorted(postings):
+        shards[shard_of(token, num_shards)][token] = postings[token]
+
+    files = {f"{SEARCH_DIR}/meta.json": json.dumps({"shards": num_shards})}
+    for n, shard in enumerate(shards):
+        files[f"{SEARCH_DIR}/{n}.json"] = json.dumps(
+            shard, ensure_ascii=False, separators=(",", ":"))
+    return files
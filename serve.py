@@ -0,0 +1,246 @@
+import argparse
+import email.utils
+import mimetypes
+import os
+import posixpath
+import threading
+import urllib.parse
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import static_assets
+
+# --- CONFIGURATION ---
+ROOT_DIR = os.getcwd()
+DEFAULT_PORT = 8000
+
+# Files up to this size are kept in memory after the first request (LRU, bounded
+# by FILE_CACHE_BYTES); bigger ones are streamed from disk with sendfile().
+CACHEABLE_FILE_SIZE = 1024 * 1024
+FILE_CACHE_BYTES = 64 * 1024 * 1024
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"   # may be stored, but must be revalidated (cheap thanks to the ETag)
+
+# Preferred order when the client accepts several
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+mimetypes.add_type("application/json", ".json")
+mimetypes.add_type("text/javascript", ".js")
+
+class FileCache:
+    """LRU cache of small file contents, keyed by path and invalidated by mtime/size."""
+
+    def __init__(self, max_bytes=FILE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()   # path -> (mtime_ns, size, data)
+        self.lock = threading.Lock()
+
+    def get(self, path, f, st):
+        """Contents of the open file f at path; st must be os.fstat() of f."""
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry and entry[:2] == (st.st_mtime_ns, st.st_size):
+                self.entries.move_to_end(path)
+                return entry[2]
+        data = f.read()
+        with self.lock:
+            old = self.entries.pop(path, None)
+            if old:
+                self.size -= len(old[2])
+            self.entries[path] = (st.st_mtime_ns, st.st_size, data)
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, (_, _, evicted) = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+        return data
+
+class Manifest:
+    """assets/build/manifest.json, reloaded whenever a build rewrites it."""
+
+    def __init__(self):
+        self.mtime = None
+        self.files = {}
+        self.lock = threading.Lock()
+
+    def entry(self, site_path):
+        try:
+            mtime = os.stat(static_assets.MANIFEST_FILE).st_mtime_ns
+        except OSError:
+            mtime = None
+        with self.lock:
+            if mtime != self.mtime:
+                self.files = static_assets.load_manifest().get("files", {}) if mtime else {}
+                self.mtime = mtime
+            return self.files.get(site_path)
+
+def accepted_encodings(header):
+    """Content codings the client accepts (q=0 excluded), e.g. {'gzip', 'br'}."""
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.partition(";")
+        params = params.strip()
+        try:
+            q = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            q = 1.0
+        if name.strip() and q > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+class SiteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive: connections are reused between requests
+    # Headers and body go out in separate writes; with Nagle on, the body waits
+    # for the client's delayed ACK and every response takes ~40ms
+    disable_nagle_algorithm = True
+    server_version = "SongHub"
+    files = FileCache()
+    manifest = Manifest()
+    quiet = False
+
+    def do_GET(self):
+        self.serve(send_body=True)
+
+    def do_HEAD(self):
+        self.serve(send_body=False)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def resolve(self):
+        """Map the request path to (file path, site path), or None if it is not a file."""
+        path = urllib.parse.unquote(urllib.parse.urlsplit(self.path).path)
+        path = posixpath.normpath("/" + path).lstrip("/")
+        if path in ("", "."):
+            path = "index.html"
+        # Never serve .git, .build_cache and the like
+        if any(part.startswith(".") for part in path.split("/")):
+            return None
+        full_path = os.path.join(ROOT_DIR, *path.split("/"))
+        if os.path.isdir(full_path):
+            path = posixpath.join(path, "index.html")
+            full_path = os.path.join(full_path, "index.html")
+        if not os.path.isfile(full_path):
+            return None
+        return full_path, path
+
+    def serve(self, send_body):
+        resolved = self.resolve()
+        if resolved is None:
+            self.send_error(404, "File not found")
+            return
+        full_path, site_path = resolved
+        # Builds replace files with os.replace(), so everything sent (headers,
+        # body, cache key) comes from the handles opened here, never the paths
+        try:
+            source_file = open(full_path, "rb")
+        except OSError:
+            self.send_error(404, "File not found")
+            return
+        with source_file:
+            source = os.fstat(source_file.fileno())
+
+            # Pick a precompressed sibling the client accepts. The build writes it
+            # right after its file, so an older sibling means the file was edited since.
+            accepted = accepted_encodings(self.headers.get("Accept-Encoding", ""))
+            for name, suffix in ENCODINGS:
+                if name not in accepted:
+                    continue
+                try:
+                    sibling_file = open(full_path + suffix, "rb")
+                except OSError:
+                    continue
+                with sibling_file:
+                    sibling = os.fstat(sibling_file.fileno())
+                    if sibling.st_mtime_ns >= source.st_mtime_ns:
+                        self.send_file(site_path, source, name, full_path + suffix,
+                                       sibling_file, sibling, send_body)
+                        return
+            self.send_file(site_path, source, None, full_path, source_file, source, send_body)
+
+    def send_file(self, site_path, source, encoding, body_path, f, st, send_body):
+        """Respond with the open file f (body_path, stat st), a representation of source."""
+        entry = self.manifest.entry(site_path)
+        immutable = bool(entry and entry.get("immutable"))
+
+        # Hashed assets never change, so their content hash is a stable ETag
+        tag = entry["hash"] if immutable else f"{source.st_mtime_ns:x}-{source.st_size:x}"
+        etag = f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+        headers = {
+            "ETag": etag,
+            "Last-Modified": email.utils.formatdate(source.st_mtime, usegmt=True),
+            "Cache-Control": IMMUTABLE if immutable else REVALIDATE,
+            "Vary": "Accept-Encoding",
+        }
+        if self.not_modified(etag, source.st_mtime):
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+
+        content_type, _ = mimetypes.guess_type(site_path)
+        content_type = content_type or "application/octet-stream"
+        if content_type.startswith("text/") or content_type == "application/json":
+            content_type += "; charset=utf-8"
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(st.st_size))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not send_body:
+            return
+
+        if st.st_size <= CACHEABLE_FILE_SIZE:
+            self.wfile.write(self.files.get(body_path, f, st))
+        else:
+            self.wfile.flush()
+            self.connection.sendfile(f, 0, st.st_size)
+
+    def not_modified(self, etag, mtime):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            # If-None-Match wins over If-Modified-Since when both are sent (RFC 9110)
+            tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since
+        return False
+
+def make_server(host="127.0.0.1", port=DEFAULT_PORT, quiet=False):
+    SiteHandler.quiet = quiet
+    server = ThreadingHTTPServer((host, port), SiteHandler)
+    server.daemon_threads = True
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the generated site from the current directory.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: %(default)s)")
+    parser.add_argument("-p", "--port", type=int, default=DEFAULT_PORT, help="port (default: %(default)s)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not log every request")
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(ROOT_DIR, "index.html")):
+        print("⚠️ No index.html here yet. Run build_index.py first.")
+    server = make_server(args.host, args.port, args.quiet)
+    print(f"🌐 Serving '{ROOT_DIR}' at http://{args.host}:{server.server_port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped.")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Shared stylesheets/scripts under content-hashed names, and the asset manifest.
+
+The CSS and JS that every generated page used to inline are written once to
+assets/build/<name>.<hash>.<ext> and linked from the pages. The name changes
+whenever the content does, so a static server can send these files with a
+long, immutable cache lifetime and browsers download them only once.
+
+assets/build/manifest.json tells such a server what it has to work with:
+
+    {"assets": {"index.css": "assets/build/index.3f9c0a1b2d.css", ...},
+     "files": {"index.html": {"hash": "…", "encodings": ["br", "gzip"]},
+               "assets/build/index.3f9c0a1b2d.css": {"hash": "…", "encodings": [...],
+                                                     "immutable": true}, ...}}
+
+Paths are relative to the site root (the working directory). Both build
+scripts merge their own files into the manifest; entries for files that no
+longer exist are dropped.
+"""
+import hashlib
+import json
+import os
+import re
+
+from file_writer import original_name, write_if_changed
+
+# --- CONFIGURATION ---
+ROOT_DIR = os.getcwd()
+ASSETS_DIR = os.path.join(ROOT_DIR, "assets", "build")
+MANIFEST_FILE = os.path.join(ASSETS_DIR, "manifest.json")
+
+HASH_LENGTH = 10
+HASHED_NAME = re.compile(r'^(?P<stem>.+)\.[0-9a-f]{%d}\.(?P<ext>\w+)$' % HASH_LENGTH)
+
+def site_path(path):
+    """Path relative to the site root with forward slashes, as used in the manifest."""
+    return os.path.relpath(os.path.abspath(path), ROOT_DIR).replace(os.sep, "/")
+
+def in_site(path):
+    """True if path is inside the site root, so pages there can link to assets/build."""
+    rel = os.path.relpath(os.path.abspath(path), ROOT_DIR)
+    return rel != os.pardir and not rel.startswith(os.pardir + os.sep)
+
+def url_from(page_dir, path):
+    """Relative URL from a page in page_dir to the file at path."""
+    return os.path.relpath(os.path.abspath(path), os.path.abspath(page_dir)).replace(os.sep, "/")
+
+def asset_path(name, text):
+    """Where the asset `name` (e.g. "index.css") with this content lives."""
+    stem, ext = os.path.splitext(name)
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+    return os.path.join(ASSETS_DIR, f"{stem}.{digest}{ext}")
+
+def prune_assets(current):
+    """Delete older versions (and their compressed siblings) of the assets in current."""
+    if not os.path.isdir(ASSETS_DIR):
+        return
+    keep = {os.path.basename(path) for path in current}
+    kinds = {HASHED_NAME.match(name).group("stem", "ext") for name in keep}
+    for name in os.listdir(ASSETS_DIR):
+        base = original_name(name)
+        match = HASHED_NAME.match(base)
+        if match and match.group("stem", "ext") in kinds and base not in keep:
+            os.remove(os.path.join(ASSETS_DIR, name))
+
+def load_manifest():
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"assets": {}, "files": {}}
+
+def update_manifest(published):
+    """Merge the entries a FileWriter published into the manifest."""
+    manifest = load_manifest()
+    files = manifest.setdefault("files", {})
+    assets = manifest.setdefault("assets", {})
+    for path, entry in published.items():
+        entry = dict(entry)
+        match = HASHED_NAME.match(os.path.basename(path))
+        if match and os.path.dirname(os.path.abspath(path)) == ASSETS_DIR:
+            entry["immutable"] = True
+            assets["{}.{}".format(*match.group("stem", "ext"))] = site_path(path)
+        files[site_path(path)] = entry
+
+    # Forget files that were removed since (stale search shards, old assets, ...)
+    for path in [p for p in files if not os.path.exists(os.path.join(ROOT_DIR, p))]:
+        del files[path]
+    manifest["files"] = dict(sorted(files.items()))
+
+    os.makedirs(ASSETS_DIR, exist_ok=True)
+    text = json.dumps(manifest, ensure_ascii=False, indent=1)
+    write_if_changed(MANIFEST_FILE, text.encode("utf-8"))
@@ -0,0 +1,49 @@
+"""Tiny compiled HTML templates shared by build_index.py and build_pages.py.
+
+Templates use str.format syntax ({name}, with {{ and }} for literal braces,
+so existing CSS blocks work unchanged) but are parsed once into a list of
+literal chunks and field names. Rendering yields chunks instead of building
+strings with +=, so a page can be written straight to a file or joined once.
+
+Every interpolated value is HTML-escaped unless it is Markup (already-rendered
+HTML). A value may also be an iterable of Markup fragments, e.g. a generator
+of rendered rows, which is streamed through without being joined first.
+"""
+import html
+from string import Formatter
+
+class Markup(str):
+    """A string of trusted HTML that must not be escaped again."""
+
+def escape(value):
+    if isinstance(value, Markup):
+        return value
+    # Attributes are always double-quoted, so apostrophes in lyrics can stay as they are
+    return Markup(html.escape(str(value), quote=False).replace('"', "&quot;"))
+
+class Template:
+    def __init__(self, source):
+        self.parts = []   # (literal text, False) or (field name, True)
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if spec or conversion:
+                raise ValueError(f"Template fields take no format spec: {{{field}}}")
+            if literal:
+                self.parts.append((literal, False))
+            if field is not None:
+                self.parts.append((field, True))
+
+    def iter_render(self, **values):
+        """Yield the rendered output chunk by chunk."""
+        for text, is_field in self.parts:
+            if not is_field:
+                yield text
+                continue
+            value = values[text]
+            if isinstance(value, str) or not hasattr(value, "__iter__"):
+                yield escape(value)
+            else:
+                for fragment in value:
+                    yield escape(fragment)
+
+    def render(self, **values):
+        return Markup("".join(self.iter_render(**values)))
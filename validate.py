@@ -0,0 +1,82 @@
+"""Checks on the song pages, run by build_index.py before anything is rendered.
+
+Everything is checked on the metadata the build already has (parsed once,
+or served from the page cache), so validation costs no extra I/O:
+
+- pages that could not be parsed at all
+- hero fields that are missing and fell back to a default
+  ("Unknown Title", no artist, the "Song" genre)
+- songs without a cover in assets/images (the card would show default.png)
+- "N." filename prefixes that are missing, duplicated or skip a number
+- lyric rows whose pinyin line is empty (or still the "..." placeholder)
+"""
+import re
+
+SONG_NUMBER_PATTERN = re.compile(r'^(\d+)\.')
+
+# What each hero field is read from, for the messages
+HERO_FIELDS = {"title": ".hero-text h1", "subtitle": ".hero-text p (artist)", "genre": ".tag-pill (genre)"}
+
+KINDS = {
+    "parse": "Pages that could not be parsed",
+    "hero": "Missing hero fields",
+    "cover": "Missing cover images",
+    "numbering": "Song numbering",
+    "pinyin": "Lyric rows without pinyin",
+}
+
+class ValidationError(Exception):
+    def __init__(self, problems):
+        super().__init__(f"{len(problems)} problem(s) found in the song pages")
+        self.problems = problems
+
+def format_rows(rows, limit=10):
+    shown = ", ".join(map(str, rows[:limit]))
+    return shown + (f" and {len(rows) - limit} more" if len(rows) > limit else "")
+
+def validate(files, metas, covers):
+    """Return a list of (kind, message) problems, in file order.
+
+    files are the song page names, metas maps a name to its meta (absent if
+    the page failed to parse) and covers maps song numbers to cover images.
+    """
+    problems = []
+    numbers = {}
+    for file in files:
+        match = SONG_NUMBER_PATTERN.match(file)
+        if match:
+            numbers.setdefault(int(match.group(1)), []).append(file)
+        else:
+            problems.append(("numbering", f"{file}: no 'N.' number prefix (sorted last)"))
+
+        meta = metas.get(file)
+        if meta is None:
+            problems.append(("parse", f"{file}: could not be parsed"))
+            continue
+        for field in meta.get("missing", []):
+            problems.append(("hero", f"{file}: no {HERO_FIELDS.get(field, field)}"))
+        if match and int(match.group(1)) not in covers:
+            problems.append(("cover", f"{file}: no assets/images/{match.group(1)}.* cover"))
+        rows = meta.get("empty_pinyin", [])
+        if rows:
+            problems.append(("pinyin", f"{file}: row(s) {format_rows(rows)}"))
+
+    for number, names in sorted(numbers.items()):
+        if len(names) > 1:
+            problems.append(("numbering", f"number {number} is used by {len(names)} pages: {', '.join(names)}"))
+    if numbers:
+        gaps = sorted(set(range(1, max(numbers) + 1)) - numbers.keys())
+        if gaps:
+            problems.append(("numbering", f"no song with number(s) {format_rows(gaps)}"))
+    return problems
+
+def print_summary(problems, fatal=True):
+    """Print the problems grouped by kind."""
+    icon = "❌" if fatal else "⚠️"
+    print(f"{icon} Validation found {len(problems)} problem(s):")
+    for kind, title in KINDS.items():
+        messages = [message for k, message in problems if k == kind]
+        if messages:
+            print(f"   {title} ({len(messages)}):")
+            for message in messages:
+                print(f"     - {message}")
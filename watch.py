@@ -0,0 +1,182 @@
+import argparse
+import os
+import queue
+import time
+import build_images
+import build_index
+import build_pages
+import static_assets
+from build_stats import stats
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    HAS_WATCHDOG = True
+except ImportError:
+    HAS_WATCHDOG = False
+
+# --- CONFIGURATION ---
+# Everything is rebuilt in this one long-running process, so the parsed-page
+# cache, the pinyin memo and the imported modules stay warm between edits.
+# Each folder is watched on its own (not recursively): assets/images/variants
+# is build output and must not trigger rebuilds.
+WATCHED_DIRS = [build_index.SONGS_DIR, build_index.IMAGES_DIR, build_pages.SONG_SOURCES_DIR]
+
+POLL_INTERVAL = 0.3   # seconds between directory scans without watchdog
+DEBOUNCE = 0.2        # rebuild once no change has been seen for this long
+
+# Editor swap/backup files, our own atomic-write temporaries and precompressed siblings
+IGNORED_SUFFIXES = ("~", ".swp", ".swx", ".tmp", ".part", ".gz", ".br")
+
+def is_relevant(path):
+    name = os.path.basename(path)
+    return (os.path.dirname(path) in WATCHED_DIRS
+            and not name.startswith(".") and not name.endswith(IGNORED_SUFFIXES))
+
+def signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+# --- CHANGE SOURCES ---
+# Both yield the set of changed paths roughly every `interval` seconds
+# (possibly empty), so debounced() can tell when a burst of saves is over.
+
+def snapshot(dirs):
+    files = {}
+    for directory in dirs:
+        if not os.path.isdir(directory):
+            continue
+        for entry in os.scandir(directory):
+            if entry.is_file():
+                st = entry.stat()
+                files[entry.path] = (st.st_mtime_ns, st.st_size)
+    return files
+
+def poll_changes(dirs, interval):
+    before = snapshot(dirs)
+    while True:
+        time.sleep(interval)
+        after = snapshot(dirs)
+        yield {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+        before = after
+
+def event_changes(dirs, interval):
+    events = queue.Queue()
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.is_directory:
+                return
+            events.put(event.src_path)
+            if getattr(event, "dest_path", None):
+                events.put(event.dest_path)
+
+    observer = Observer()
+    for directory in dirs:
+        if os.path.isdir(directory):
+            observer.schedule(Handler(), directory, recursive=False)
+    observer.start()
+    try:
+        while True:
+            changed = set()
+            try:
+                changed.add(events.get(timeout=interval))
+                while True:
+                    changed.add(events.get_nowait())
+            except queue.Empty:
+                pass
+            yield changed
+    finally:
+        observer.stop()
+        observer.join()
+
+def debounced(changes, delay, ignore):
+    """Group bursts of changes into one batch, emitted after `delay` seconds of quiet.
+
+    ignore maps paths we wrote ourselves to their signature; events for them
+    are dropped as long as the file is still exactly what we wrote.
+    """
+    pending = set()
+    last_change = 0.0
+    for changed in changes:
+        changed = {path for path in changed
+                   if is_relevant(path) and not (path in ignore and ignore[path] == signature(path))}
+        now = time.monotonic()
+        if changed:
+            pending |= changed
+            last_change = now
+        elif pending and now - last_change >= delay:
+            yield sorted(pending)
+            pending = set()
+
+# --- REBUILD ---
+
+def rebuild(paths, args, ignore):
+    """Regenerate what depends on the changed paths, then bring the index up to date."""
+    stats.reset("watch")
+    sources = [p for p in paths
+               if os.path.dirname(p) == build_pages.SONG_SOURCES_DIR and os.path.isfile(p)]
+    covers_changed = any(os.path.dirname(p) == build_index.IMAGES_DIR for p in paths)
+
+    for source in sources:
+        for page in build_pages.build_files(source, out_dir=args.pages_dir):
+            ignore[os.path.abspath(page)] = signature(page)
+    if covers_changed and build_images.HAS_PIL:
+        build_images.build_variants()
+    # Only the pages whose mtime/size changed are parsed again (see cached_metadata).
+    # Validation problems are shown but do not stop the preview from updating.
+    build_index.build(args.jobs, args.lyrics_index, strict=False)
+    print(stats.summary())
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Watch songs/, assets/images and the song sources and rebuild on every change.")
+    parser.add_argument("-j", "--jobs", type=build_index.job_count, default=1,
+                        help="passed to build_index (0 = one worker per CPU core)")
+    parser.add_argument("--no-lyrics-index", dest="lyrics_index", action="store_false",
+                        help="skip the full-text lyrics search index")
+    parser.add_argument("--pages-dir", default=build_index.ROOT_DIR,
+                        help="where pages generated from the song sources are written "
+                             "(default: the current directory, like build_pages.py)")
+    parser.add_argument("--poll", action="store_true",
+                        help="scan the folders periodically even if watchdog is installed")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL,
+                        help="seconds between scans when polling (default: %(default)s)")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE,
+                        help="seconds of quiet to wait for before rebuilding (default: %(default)s)")
+    args = parser.parse_args()
+    if not static_assets.in_site(args.pages_dir):
+        parser.error(f"--pages-dir must be inside the site root ('{static_assets.ROOT_DIR}')")
+
+    if not os.path.exists(build_index.SONGS_DIR):
+        print(f"❌ Error: The folder '{build_index.SONGS_DIR}' does not exist.")
+        exit()
+
+    rebuild([], args, {})
+
+    if HAS_WATCHDOG and not args.poll:
+        changes = event_changes(WATCHED_DIRS, min(args.interval, args.debounce))
+        mode = "filesystem events"
+    else:
+        changes = poll_changes(WATCHED_DIRS, args.interval)
+        mode = f"polling every {args.interval}s"
+    print(f"👀 Watching {', '.join(os.path.relpath(d) for d in WATCHED_DIRS)} ({mode}). Ctrl+C to stop.")
+
+    ignore = {}
+    try:
+        for paths in debounced(changes, args.debounce, ignore):
+            names = ", ".join(os.path.basename(p) for p in paths[:3])
+            more = f" and {len(paths) - 3} more" if len(paths) > 3 else ""
+            print(f"\n🔄 Changed: {names}{more}")
+            try:
+                rebuild(paths, args, ignore)
+            except Exception as e:
+                # A half-saved file must not end the session; the next save retries
+                print(f"❌ Rebuild failed: {e}")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching.")
+
+if __name__ == "__main__":
+    main()